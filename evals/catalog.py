@@ -16,32 +16,32 @@ EASY = [
         file="src/glassbox/trust_db.py",
         title="[Bug] EMA learning rate is 1.0 instead of 0.1 - trust scores jump wildly",
         body="In update_trust(), the EMA factor is 1.0 instead of 0.1.\nThis makes scores jump to extremes on every update.",
-        original="old_score + 0.1 * ((1.0",
-        mutation="old_score + 1.0 * ((1.0",
+        original="score + 0.1 * (?3 - score)",
+        mutation="score + 1.0 * (?3 - score)",
     ),
     BugSpec(
         id="E03", difficulty="easy",
         file="src/glassbox/trust_db.py",
         title="[Bug] Trust floor is 0.03 instead of 0.30 - agents can drop to near-zero",
-        body="In update_trust(), `max(0.3, ...)` should enforce floor at 0.30 but it's set to 0.03.",
-        original="max(0.3, min(1.0,",
-        mutation="max(0.03, min(1.0,",
+        body="In update_trust()'s UPSERT, `MAX(0.3, ...)` should enforce floor at 0.30 but it's set to 0.03.",
+        original="SET score = MAX(0.3, MIN(1.0,",
+        mutation="SET score = MAX(0.03, MIN(1.0,",
     ),
     BugSpec(
         id="E04", difficulty="easy",
         file="src/glassbox/trust_db.py",
         title="[Bug] min/max swapped in trust update - scores always clamp to 0.3",
-        body="In update_trust(), `max(0.3, min(1.0, ...))` is swapped.\nResult: scores always return 0.3.",
-        original="max(0.3, min(1.0,",
-        mutation="min(0.3, max(1.0,",
+        body="In update_trust()'s UPSERT, `MAX(0.3, MIN(1.0, ...))` is swapped.\nResult: scores always return 0.3.",
+        original="SET score = MAX(0.3, MIN(1.0,",
+        mutation="SET score = MIN(0.3, MAX(1.0,",
     ),
     BugSpec(
         id="E05", difficulty="easy",
         file="src/glassbox/trust_db.py",
         title="[Bug] get_all_scores() queries wrong table name 'trust_score'",
         body="get_all_scores() references `trust_score` (missing trailing 's').\nCauses sqlite3.OperationalError at runtime.",
-        original="FROM trust_scores ORDER",
-        mutation="FROM trust_score ORDER",
+        original="FROM trust_scores WHERE namespace = ? ORDER",
+        mutation="FROM trust_score WHERE namespace = ? ORDER",
     ),
     BugSpec(
         id="E06", difficulty="easy",
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Streamable-HTTP server load test — MCP tool calls/sec and latency from many concurrent clients.
+
+Starts `glassbox-ai --transport streamable-http` in a subprocess (against the offline OpenAI stub, in a temp
+dir), opens --clients MCP sessions and has each call a tool back to back for --duration seconds:
+
+    python scripts/bench_http.py --clients 32 --workers 1
+    python scripts/bench_http.py --clients 64 --workers 4 --tool analyze --latency fixed:0.05
+"""
+
+import argparse, asyncio, os, signal, socket, statistics, subprocess, sys, tempfile, threading, time
+from concurrent.futures import ProcessPoolExecutor
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+sys.path.insert(0, SRC)
+
+from mcp import ClientSession  # noqa: E402
+from mcp.client.streamable_http import streamable_http_client  # noqa: E402
+
+from glassbox.backends import StubProfile  # noqa: E402
+from glassbox.stub_server import StubServer  # noqa: E402
+
+TOOLS = {
+    "trust_scores": {"limit": 10},
+    "update_trust": {"agent": "critic", "was_correct": True},
+    "analyze": {"task": "Redis or Postgres for a job queue?", "no_cache": True},
+}
+
+
+def start_stub(profile):
+    loop, server, ready = asyncio.new_event_loop(), StubServer(profile, port=0), threading.Event()
+    def run():
+        loop.run_until_complete(server.start())
+        ready.set()
+        loop.run_forever()
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return server
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"server did not listen on :{port} within {timeout}s")
+
+
+def pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+async def load(url, tool, clients, duration):
+    latencies, errors = [], 0
+
+    async def client():
+        nonlocal errors
+        async with streamable_http_client(url) as (read, write, _), ClientSession(read, write) as session:
+            await session.initialize()
+            deadline = time.perf_counter() + duration
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                result = await session.call_tool(tool, TOOLS[tool])
+                latencies.append(time.perf_counter() - start)
+                errors += bool(result.isError)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(clients)])
+    return latencies, errors, time.perf_counter() - start
+
+
+def load_process(url, tool, clients, duration):
+    return asyncio.run(load(url, tool, clients, duration))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--tool", choices=sorted(TOOLS), default="trust_scores")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds each client keeps calling")
+    parser.add_argument("--procs", type=int, default=min(4, os.cpu_count() or 1),
+                        help="client processes the sessions are spread over (one Python MCP client saturates a core first)")
+    parser.add_argument("--latency", default="fixed:0.05", help="stub LLM latency (only matters for --tool analyze)")
+    args = parser.parse_args()
+
+    stub, port = start_stub(StubProfile(args.latency, seed=42)), free_port()
+    env = {**os.environ, "PYTHONPATH": os.path.abspath(SRC), "OPENAI_BASE_URL": stub.base_url, "OPENAI_API_KEY": "stub"}
+    with tempfile.TemporaryDirectory() as tmp:
+        server = subprocess.Popen([sys.executable, "-m", "glassbox.server", "--transport", "streamable-http", "--port", str(port),
+                                   "--workers", str(args.workers)], cwd=tmp, env=env)
+        try:
+            wait_for_port(port)
+            url, procs = f"http://127.0.0.1:{port}/mcp", min(args.procs, args.clients)
+            with ProcessPoolExecutor(procs) as pool:
+                shares = [args.clients // procs + (i < args.clients % procs) for i in range(procs)]
+                runs = list(pool.map(load_process, [url] * procs, [args.tool] * procs, shares, [args.duration] * procs))
+            latencies, errors = [x for lat, _, _ in runs for x in lat], sum(e for _, e, _ in runs)
+            elapsed = max(t for _, _, t in runs)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            stopped = time.perf_counter()
+            code = server.wait(timeout=60)
+        print(f"tool={args.tool} clients={args.clients} (over {procs} processes) workers={args.workers} stub latency={args.latency}")
+        print(f"{len(latencies):,} calls in {elapsed:.1f}s = {len(latencies) / elapsed:,.0f} req/s, errors={errors}")
+        print(f"latency p50={statistics.median(latencies) * 1e3:.1f}ms p95={pct(latencies, 95) * 1e3:.1f}ms p99={pct(latencies, 99) * 1e3:.1f}ms")
+        print(f"SIGTERM -> drained and exited ({code}) in {time.perf_counter() - stopped:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
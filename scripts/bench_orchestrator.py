@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Offline orchestrator load test — debates/sec and tail latency at several concurrency levels.
+
+Runs MultiAgentOrchestrator.debate against the local OpenAI-compatible stub (no network, no spend):
+
+    python scripts/bench_orchestrator.py --levels 1,4,16,64 --latency lognormal:0.3,0.5
+    python scripts/bench_orchestrator.py --backend inproc   # skip HTTP, measure orchestration only
+"""
+
+import argparse, asyncio, os, statistics, sys, tempfile, threading, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from glassbox.admission import AdmissionController  # noqa: E402
+from glassbox.backends import OpenAIBackend, StubBackend, StubProfile  # noqa: E402
+from glassbox.orchestrator import MultiAgentOrchestrator  # noqa: E402
+from glassbox.stub_server import StubServer  # noqa: E402
+from glassbox.trust_db import TrustDB  # noqa: E402
+
+
+def start_stub(profile):
+    """Run the stub HTTP server on its own event loop thread so it doesn't share the benchmark's loop."""
+    loop, server, ready = asyncio.new_event_loop(), StubServer(profile, port=0), threading.Event()
+    def run():
+        loop.run_until_complete(server.start())
+        ready.set()
+        loop.run_forever()
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return server
+
+
+def pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+async def run_level(args, make_backend, db_path, concurrency):
+    backend = make_backend()
+    orch = MultiAgentOrchestrator(cache_path=None, backend=backend, trust_db=TrustDB(db_path), debate_path=None,
+                                  admission=AdmissionController(default_concurrency=10_000, model_concurrency={}, rpm=1e9, tpm=1e12, max_queue=10_000))
+    total = max(args.min_debates, concurrency * args.debates_per_worker)
+    sem, latencies = asyncio.Semaphore(concurrency), []
+
+    async def one(i):
+        async with sem:
+            start = time.perf_counter()
+            await orch.debate(f"Benchmark topic #{i}: Redis or Postgres?", parallel=args.parallel, adaptive=args.adaptive)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(total)])
+    elapsed = time.perf_counter() - start
+    await backend.aclose()
+    return {"concurrency": concurrency, "debates": total, "debates_per_s": total / elapsed, "p50": statistics.median(latencies),
+            "p95": pct(latencies, 95), "p99": pct(latencies, 99), "errors": sum(orch.metrics.errors.values())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["http", "inproc"], default="http")
+    parser.add_argument("--base-url", default=None, help="use an already running stub (skips starting one)")
+    parser.add_argument("--levels", default="1,4,16,64")
+    parser.add_argument("--debates-per-worker", type=int, default=3)
+    parser.add_argument("--min-debates", type=int, default=8)
+    parser.add_argument("--latency", default="lognormal:0.3,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--serial", dest="parallel", action="store_false", help="serial turns inside each round")
+    parser.add_argument("--adaptive", action="store_true")
+    args = parser.parse_args()
+
+    profile = StubProfile(args.latency, args.error_rate, seed=42)
+    if args.backend == "inproc":
+        make_backend = lambda: StubBackend(profile)
+    else:
+        base_url = args.base_url or start_stub(profile).base_url
+        make_backend = lambda: OpenAIBackend(api_key="stub", base_url=base_url)  # one client per event loop
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"backend={args.backend} latency={args.latency} error_rate={args.error_rate} parallel={args.parallel}")
+        print(f"{'conc':>5} {'debates':>8} {'deb/s':>8} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'errors':>7}")
+        for level in [int(x) for x in args.levels.split(",")]:
+            r = asyncio.run(run_level(args, make_backend, os.path.join(tmp, f"trust_{level}.db"), level))
+            print(f"{r['concurrency']:>5} {r['debates']:>8} {r['debates_per_s']:>8.2f} {r['p50']:>7.2f} {r['p95']:>7.2f} {r['p99']:>7.2f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
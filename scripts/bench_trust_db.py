@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""TrustDB micro-benchmark — ops/sec for get_trust / update_trust / get_all_scores.
+
+Compares the current TrustDB against the old connect-per-call, rollback-journal implementation:
+
+    python scripts/bench_trust_db.py --ops 5000 --threads 4
+"""
+
+import argparse, os, sqlite3, sys, tempfile, threading, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from glassbox.trust_db import TrustDB  # noqa: E402
+
+AGENTS = ["architect", "pragmatist", "critic"]
+
+
+class ConnectPerCallTrustDB:
+    """The pre-WAL TrustDB: sqlite3.connect + close around every call, default DELETE journal."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE IF NOT EXISTS trust_scores (agent TEXT PRIMARY KEY, score REAL DEFAULT 0.85, correct_count INTEGER DEFAULT 0, total_count INTEGER DEFAULT 0, last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+        for agent in AGENTS:
+            conn.execute("INSERT OR IGNORE INTO trust_scores (agent, score) VALUES (?, 0.85)", (agent,))
+        conn.commit()
+        conn.close()
+
+    def get_trust(self, agent):
+        conn = sqlite3.connect(self.db_path)
+        result = conn.execute("SELECT score FROM trust_scores WHERE agent = ?", (agent,)).fetchone()
+        conn.close()
+        return result[0] if result else 0.85
+
+    def get_all_scores(self):
+        conn = sqlite3.connect(self.db_path)
+        results = conn.execute("SELECT agent, score FROM trust_scores ORDER BY score DESC").fetchall()
+        conn.close()
+        return dict(results)
+
+    def update_trust(self, agent, was_correct):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        old, correct, total = conn.execute("SELECT score, correct_count, total_count FROM trust_scores WHERE agent = ?", (agent,)).fetchone()
+        new = max(0.3, min(1.0, old + 0.1 * ((1.0 if was_correct else 0.0) - old)))
+        conn.execute("UPDATE trust_scores SET score=?, correct_count=?, total_count=?, last_updated=CURRENT_TIMESTAMP WHERE agent=?",
+                     (new, correct + was_correct, total + 1, agent))
+        conn.commit()
+        conn.close()
+
+
+def measure(db, op, ops, threads):
+    per_thread = ops // threads
+    def work(t):
+        for i in range(per_thread):
+            agent = AGENTS[(i + t) % 3]
+            if op == "get_trust":
+                db.get_trust(agent)
+            elif op == "get_all_scores":
+                db.get_all_scores()
+            else:
+                db.update_trust(agent, i % 2 == 0)
+    workers = [threading.Thread(target=work, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        impls = {"connect-per-call": ConnectPerCallTrustDB(os.path.join(tmp, "old.db")), "TrustDB": TrustDB(os.path.join(tmp, "new.db"))}
+        print(f"ops={args.ops} threads={args.threads}")
+        print(f"{'op':<16} " + " ".join(f"{name:>18}" for name in impls) + f" {'speedup':>9}")
+        for op in ("get_trust", "get_all_scores", "update_trust"):
+            rates = [measure(db, op, args.ops, args.threads) for db in impls.values()]
+            print(f"{op:<16} " + " ".join(f"{r:>14,.0f} o/s" for r in rates) + f" {rates[-1] / rates[0]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
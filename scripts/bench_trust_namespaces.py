@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Namespaced TrustDB scaling benchmark — point reads, panel reads, top-k pages and updates at 10k agents × 100 namespaces.
+
+Fills one file with agents × namespaces trust rows, then times each query against the full table:
+
+    python scripts/bench_trust_namespaces.py                       # 10,000 agents × 100 namespaces (1M rows)
+    python scripts/bench_trust_namespaces.py --agents 1000 --namespaces 10 --ops 2000
+"""
+
+import argparse, os, random, sys, tempfile, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from glassbox.trust_db import TrustDB  # noqa: E402
+
+
+def pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+def timed(ops, fn):
+    samples = []
+    for i in range(ops):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return ops / sum(samples), pct(samples, 50) * 1e6, pct(samples, 99) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=10_000, help="agents per namespace")
+    parser.add_argument("--namespaces", type=int, default=100)
+    parser.add_argument("--ops", type=int, default=5000, help="timed operations per query type")
+    parser.add_argument("--panel", type=int, default=20, help="agents per get_trust_many / update_trust_many call")
+    parser.add_argument("--top", type=int, default=10, help="page size for the top-k query")
+    args = parser.parse_args()
+    rng = random.Random(42)
+    namespaces = [f"team-{n:03d}" for n in range(args.namespaces)]
+    agent = lambda i: f"agent-{i:05d}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = TrustDB(os.path.join(tmp, "trust.db"), compact_every=0)
+        start = time.perf_counter()
+        for ns in namespaces:  # one transaction per namespace, a few outcomes per agent so scores spread out
+            db.update_trust_many([(agent(i), rng.random() < 0.6) for i in range(args.agents) for _ in range(2)], namespace=ns)
+        load = time.perf_counter() - start
+        rows = db._conn.execute("SELECT COUNT(*) FROM trust_scores").fetchone()[0]
+        print(f"{rows:,} trust rows, {2 * args.agents * args.namespaces:,} events; load {load:.1f}s "
+              f"({2 * args.agents * args.namespaces / load:,.0f} updates/s in bulk)")
+
+        ns = lambda: rng.choice(namespaces)
+        panel = lambda: [agent(rng.randrange(args.agents)) for _ in range(args.panel)]
+        cases = {
+            "get_trust": lambda i: db.get_trust(agent(rng.randrange(args.agents)), ns()),
+            f"get_trust_many({args.panel})": lambda i: db.get_trust_many(panel(), ns()),
+            f"top-{args.top} page 1": lambda i: db.get_all_scores(ns(), limit=args.top),
+            f"top-{args.top} page 100": lambda i: db.get_all_scores(ns(), limit=args.top, offset=99 * args.top),
+            "update_trust": lambda i: db.update_trust(agent(rng.randrange(args.agents)), i % 2 == 0, ns()),
+            f"update_trust_many({args.panel})": lambda i: db.update_trust_many([(a, True) for a in panel()], ns()),
+            "new namespace + agent": lambda i: db.update_trust("newcomer", True, f"fresh-{i}"),
+            "full namespace scan": lambda i: db.get_all_scores(ns()),
+        }
+        print(f"{'op':<24} {'ops/s':>10} {'p50 µs':>9} {'p99 µs':>9}")
+        for name, fn in cases.items():
+            ops = args.ops if name != "full namespace scan" else max(1, args.ops // 100)
+            rate, p50, p99 = timed(ops, fn)
+            print(f"{name:<24} {rate:>10,.0f} {p50:>9,.0f} {p99:>9,.0f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Admission control for LLM calls: per-model concurrency, RPM/TPM token buckets, bounded wait queue."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+MODEL_CONCURRENCY = {"gpt-4o": 8, "gpt-4o-mini": 16}  # in-flight requests per model; others get default_concurrency
+
+
+class AdmissionRejected(Exception):
+    """The wait queue is full, or admission would take longer than max_wait. Caller should retry later."""
+
+
+class TokenBucket:
+    """Refills rate_per_minute units per minute, holding at most one minute's worth."""
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (0 if it is available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+
+class AdmissionController:
+    def __init__(self, model_concurrency: Optional[Dict[str, int]] = None, default_concurrency: int = 8,
+                 rpm: float = 500, tpm: float = 200_000, max_queue: int = 64, max_wait: float = 30.0):
+        self.model_concurrency = dict(MODEL_CONCURRENCY if model_concurrency is None else model_concurrency)
+        self.default_concurrency = default_concurrency
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.waiting = self.in_flight = self.admitted = self.rejected = 0
+        self.total_wait = self.max_seen_wait = 0.0
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        if model not in self._semaphores:
+            self._semaphores[model] = asyncio.Semaphore(self.model_concurrency.get(model, self.default_concurrency))
+        return self._semaphores[model]
+
+    def _reject(self, reason: str):
+        self.rejected += 1
+        raise AdmissionRejected(reason)
+
+    @asynccontextmanager
+    async def slot(self, model: str, tokens: int):
+        """Hold one request slot for model, charging 1 request and ~tokens to the buckets."""
+        if self.waiting >= self.max_queue:
+            self._reject(f"wait queue full ({self.waiting} waiting)")
+        sem, start = self._semaphore(model), time.monotonic()
+        self.waiting += 1
+        try:
+            if sem.locked():
+                try:
+                    await asyncio.wait_for(sem.acquire(), self.max_wait)
+                except asyncio.TimeoutError:
+                    self._reject(f"no {model} slot within {self.max_wait:.0f}s")
+            else:
+                await sem.acquire()
+            try:
+                while (wait := max(self.requests.wait_time(1), self.tokens.wait_time(tokens))) > 0:
+                    if time.monotonic() - start + wait > self.max_wait:
+                        self._reject(f"rate limit would delay more than {self.max_wait:.0f}s")
+                    await asyncio.sleep(wait)
+            except BaseException:
+                sem.release()
+                raise
+            self.requests.take(1)
+            self.tokens.take(tokens)
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - start
+        self.admitted += 1
+        self.total_wait += waited
+        self.max_seen_wait = max(self.max_seen_wait, waited)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            sem.release()
+
+    def stats(self) -> Dict:
+        return {"queue_depth": self.waiting, "in_flight": self.in_flight, "admitted": self.admitted, "rejected": self.rejected,
+                "avg_wait_ms": 1000 * self.total_wait / self.admitted if self.admitted else 0.0, "max_wait_ms": 1000 * self.max_seen_wait}
@@ -0,0 +1,132 @@
+"""LLM backends for MultiAgentOrchestrator — OpenAI (or any OpenAI-compatible server) and an offline stub."""
+
+import asyncio
+import math
+import os
+import random
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional
+
+from .transcript import estimate_tokens
+
+
+class Completion(NamedTuple):
+    text: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+
+
+class BackendError(Exception):
+    """A backend call failed (the stub raises this for injected errors)."""
+
+
+class LLMBackend(ABC):
+    @abstractmethod
+    async def complete(self, model: str, temperature: float, max_tokens: int, messages: List[Dict]) -> Completion:
+        ...
+
+    async def warm(self):
+        """Prepare for the first call (imports, connections) without making a billable request."""
+
+    async def aclose(self):
+        pass
+
+
+class OpenAIBackend(LLMBackend):
+    """AsyncOpenAI chat completions. base_url (or OPENAI_BASE_URL) can point at any OpenAI-compatible server,
+    e.g. `python -m glassbox.stub_server` for load tests."""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, client=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=self.api_key or os.getenv("OPENAI_API_KEY"), base_url=self.base_url)
+        return self._client
+
+    async def complete(self, model, temperature, max_tokens, messages):
+        r = await self.client.chat.completions.create(model=model, temperature=temperature, max_tokens=max_tokens, messages=messages)
+        text, usage = r.choices[0].message.content, getattr(r, "usage", None)
+        if usage is None:
+            return Completion(text, model, estimate_tokens("".join(m["content"] for m in messages)), estimate_tokens(text or ""))
+        return Completion(text, model, usage.prompt_tokens, usage.completion_tokens)
+
+    async def warm(self):
+        """Import openai off the event loop and open the pooled HTTP connection (TCP + TLS) with a GET /models,
+        so the first completion doesn't pay for either. Failures are ignored; the real call will report them."""
+        try:
+            client = await asyncio.to_thread(lambda: self.client)
+            await client.with_options(timeout=5.0, max_retries=0).models.list()
+        except Exception:
+            pass
+
+    async def aclose(self):
+        if self._client is not None and hasattr(self._client, "close"):
+            await self._client.close()
+
+
+# Canned replies: first key found in system+user wins, "*" is the fallback. Templates see {agent}, {model}, {task}.
+STUB_RESPONSES = {
+    "Analyze Round": "{{}}",
+    "Summarize this debate": "Converged plan for {task}: start simple, measure, then scale the hot path.",
+    "*": "@{agent} [{model}] on {task}: I'd ship the simplest option first and revisit once we have load data.",
+}
+
+
+class StubProfile:
+    """Latency distribution, error rate and templated replies shared by StubBackend and the stub HTTP server.
+
+    latency specs: "fixed:S", "uniform:LO,HI", "lognormal:MEDIAN,SIGMA", "exp:MEAN" (seconds).
+    """
+
+    def __init__(self, latency: str = "lognormal:0.8,0.4", error_rate: float = 0.0,
+                 responses: Optional[Dict[str, str]] = None, seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.responses = dict(STUB_RESPONSES if responses is None else responses)
+        self.rng = random.Random(seed)
+        kind, _, args = latency.partition(":")
+        self._kind, self._args = kind, [float(a) for a in args.split(",") if a]
+        if kind not in ("fixed", "uniform", "lognormal", "exp"):
+            raise ValueError(f"unknown latency distribution: {latency}")
+
+    def sample_latency(self) -> float:
+        a = self._args
+        if self._kind == "fixed":
+            return a[0]
+        if self._kind == "uniform":
+            return self.rng.uniform(a[0], a[1])
+        if self._kind == "lognormal":
+            return self.rng.lognormvariate(math.log(a[0]), a[1])
+        return self.rng.expovariate(1.0 / a[0])
+
+    def should_fail(self) -> bool:
+        return self.rng.random() < self.error_rate
+
+    def reply(self, model: str, messages: List[Dict]) -> str:
+        system = messages[0]["content"] if messages else ""
+        user = messages[-1]["content"] if messages else ""
+        agent = re.search(r"@(\w+)", system)
+        task = re.search(r"^(?:TASK|Task): (.*)$", user, re.M)
+        template = next((t for k, t in self.responses.items() if k != "*" and k in system + user), self.responses.get("*", ""))
+        return template.format(agent=agent.group(1) if agent else "assistant", model=model, task=(task.group(1) if task else user.splitlines()[0] if user else "")[:120])
+
+
+class StubBackend(LLMBackend):
+    """In-process OpenAI stand-in: sleeps a sampled latency, fails at error_rate, returns templated text."""
+
+    def __init__(self, profile: Optional[StubProfile] = None):
+        self.profile = profile or StubProfile()
+
+    async def complete(self, model, temperature, max_tokens, messages):
+        await asyncio.sleep(self.profile.sample_latency())
+        if self.profile.should_fail():
+            raise BackendError("stub injected error")
+        text = self.profile.reply(model, messages)
+        return Completion(text, model, estimate_tokens("".join(m["content"] for m in messages)), estimate_tokens(text))
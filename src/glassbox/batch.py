@@ -0,0 +1,49 @@
+"""Batch CLI — run a file of tasks through MultiAgentOrchestrator.execute_many and write JSONL results."""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from .metrics import tool_scope
+from .orchestrator import MultiAgentOrchestrator
+from .trust_db import DEFAULT_NAMESPACE
+
+
+def load_tasks(path):
+    """One task per line; JSONL lines of the form {"task": "..."} are accepted too. Blank lines are skipped."""
+    tasks = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                line = json.loads(line)["task"]
+            tasks.append(line)
+    return tasks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="glassbox-ai-batch", description="Run many tasks across agents with bounded parallelism.")
+    parser.add_argument("tasks", help="file with one task per line (or JSONL with a 'task' field)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output path (default: stdout)")
+    parser.add_argument("-a", "--agents", default=None, help="comma-separated agent names (default: all)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="max in-flight (task, agent) calls")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the response cache")
+    parser.add_argument("-n", "--namespace", default=DEFAULT_NAMESPACE, help="trust namespace (repository or team)")
+    args = parser.parse_args(argv)
+
+    tasks = load_tasks(args.tasks)
+    agents = [a.strip() for a in args.agents.split(",")] if args.agents else None
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        with tool_scope("batch"):
+            asyncio.run(MultiAgentOrchestrator().execute_many(tasks, agents, args.concurrency, sink, use_cache=not args.no_cache, namespace=args.namespace))
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Cheap local convergence check for debate rounds — bag-of-words cosine plus explicit stance markers."""
+
+import math
+import re
+from collections import Counter
+from itertools import combinations
+from typing import List, Tuple
+
+CONVERGENCE_THRESHOLD = 0.35  # mean pairwise cosine at or above which a round counts as converged
+_STOPWORDS = frozenset("""the and for that this with you are but not have should will would can could just its it's
+they them their then than what when where which who why how was were been being from into about over under
+use using your our out all any more most some such only also very too yes agree disagree architect pragmatist critic""".split())
+_DISSENT = re.compile(r"\b(i disagree|disagree with|strongly disagree)\b", re.I)
+
+
+def _bag(text: str) -> Counter:
+    return Counter(w for w in re.findall(r"[a-z][a-z0-9']+", text.lower()) if len(w) > 2 and w not in _STOPWORDS)
+
+
+def similarity(a: str, b: str) -> float:
+    """Cosine similarity of the two texts' content-word counts (0..1)."""
+    ca, cb = _bag(a), _bag(b)
+    dot = sum(ca[w] * cb[w] for w in ca.keys() & cb.keys())
+    norm = math.sqrt(sum(v * v for v in ca.values())) * math.sqrt(sum(v * v for v in cb.values()))
+    return dot / norm if norm else 0.0
+
+
+def converged(texts: List[str], threshold: float = CONVERGENCE_THRESHOLD) -> Tuple[bool, float]:
+    """(converged, mean pairwise similarity). Any explicit dissent in the round blocks convergence."""
+    if len(texts) < 2:
+        return True, 1.0
+    score = sum(similarity(a, b) for a, b in combinations(texts, 2)) / math.comb(len(texts), 2)
+    return score >= threshold and not any(_DISSENT.search(t) for t in texts), score
@@ -0,0 +1,58 @@
+"""SQLite store of finished debates — transcript, cached round digests and per-round prompts, keyed by debate ID."""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class DebateStore:
+    """One long-lived WAL-mode connection behind a lock. Methods block on SQLite, so async callers
+    run them on a worker thread (the orchestrator uses asyncio.to_thread)."""
+
+    def __init__(self, db_path: str = "debates.db", ttl: float = 7 * 24 * 3600, max_entries: int = 500):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_db()
+
+    def _init_db(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS debates (
+                    id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_debates_updated ON debates (updated)")
+
+    def save(self, debate_id: str, state: Dict):
+        """Insert or replace a debate's state, then drop debates idle past ttl and the oldest beyond max_entries."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("""INSERT INTO debates (id, state, created, updated) VALUES (?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET state = excluded.state, updated = excluded.updated""",
+                               (debate_id, json.dumps(state, ensure_ascii=False), now, now))
+            self._conn.execute("DELETE FROM debates WHERE updated <= ?", (now - self.ttl,))
+            self._conn.execute("DELETE FROM debates WHERE id IN (SELECT id FROM debates ORDER BY updated DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def load(self, debate_id: str) -> Optional[Dict]:
+        """Stored state, or None if the debate is unknown or has expired."""
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM debates WHERE id = ? AND updated > ?", (debate_id, time.time() - self.ttl)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM debates").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
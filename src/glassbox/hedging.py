@@ -0,0 +1,53 @@
+"""Per-call deadlines and latency-percentile hedging for orchestrator LLM calls."""
+
+from collections import defaultdict, deque
+from typing import Dict, Optional
+
+HEDGE_FALLBACK = {"gpt-4o": "gpt-4o-mini"}  # model → model a duplicate request goes to when the first runs slow
+DEFAULT_DEADLINE = 60.0  # seconds per _ask unless the agent has its own entry in deadlines
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per model."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, model: str, seconds: float):
+        self._samples[model].append(seconds)
+
+    def percentile(self, model: str, p: float) -> Optional[float]:
+        """p-th percentile latency for model, or None until min_samples calls have been seen."""
+        samples = self._samples.get(model)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+class HedgePolicy:
+    """Deadlines always apply; duplicate requests to a fallback model are opt-in (enabled=True)."""
+
+    def __init__(self, fallback: Optional[Dict[str, str]] = None, percentile: float = 95,
+                 deadline: float = DEFAULT_DEADLINE, deadlines: Optional[Dict[str, float]] = None, enabled: bool = False):
+        self.fallback = dict(HEDGE_FALLBACK if fallback is None else fallback)
+        self.percentile = percentile
+        self.deadline = deadline
+        self.deadlines = deadlines or {}
+        self.enabled = enabled
+        self.latency = LatencyTracker()
+        self.calls = self.hedged = self.hedge_wins = self.timeouts = 0
+
+    def deadline_for(self, agent: str) -> float:
+        return self.deadlines.get(agent, self.deadline)
+
+    def hedge_after(self, model: str) -> Optional[float]:
+        """Seconds to wait on model before sending a duplicate to its fallback (None = never hedge)."""
+        if not self.enabled or model not in self.fallback:
+            return None
+        return self.latency.percentile(model, self.percentile)
+
+    def stats(self) -> Dict:
+        return {"calls": self.calls, "hedged": self.hedged, "hedge_rate": self.hedged / self.calls if self.calls else 0.0,
+                "hedge_wins": self.hedge_wins, "timeouts": self.timeouts}
@@ -0,0 +1,122 @@
+"""In-process background jobs: long debates run detached from the MCP request and are polled by ID."""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+JOB_TTL = 3600.0  # seconds a finished job's result stays fetchable
+MAX_JOBS = 100    # running + finished jobs held at once
+
+
+class JobTableFull(Exception):
+    """Every slot in the job table holds a running job. Caller should retry later."""
+
+
+class Job:
+    def __init__(self, key: Hashable):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.status = "running"  # → done | failed | cancelled
+        self.created, self.finished = time.time(), None
+        self.partial = ""  # transcript so far, replaced by each progress report
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def snapshot(self) -> Dict:
+        end = self.finished or time.time()
+        return {"id": self.id, "status": self.status, "elapsed": end - self.created, "error": self.error}
+
+
+class JobManager:
+    """Bounded table of jobs keyed by ID. Submitting the parameters of a job that is still running — or finished
+    with a reusable result — returns that job instead of starting another, so a client that retries is never
+    charged twice. Finished jobs are evicted ttl seconds after they finish, or oldest-first when the table is full."""
+
+    def __init__(self, max_jobs: int = MAX_JOBS, ttl: float = JOB_TTL):
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._by_key: Dict[Hashable, str] = {}
+        self.submitted = self.deduped = self.evicted = 0
+
+    def submit(self, key: Hashable, fn: Callable[[Callable[[str], None]], Awaitable[str]], reuse_result: bool = True) -> Job:
+        """Start fn(progress) as a background job, or return the job already registered under key.
+        fn reports its partial transcript through progress(text). reuse_result=False only dedupes against a
+        job still running: a finished one is replaced by a fresh run."""
+        self._sweep()
+        job = self._jobs.get(self._by_key.get(key, ""))
+        if job is not None and (job.status == "running" or (job.status == "done" and reuse_result)):
+            self.deduped += 1
+            return job
+        if len(self._jobs) >= self.max_jobs and not self._evict_oldest_finished():
+            raise JobTableFull(f"{len(self._jobs)} jobs running (max_jobs={self.max_jobs})")
+        job = Job(key)
+        self._jobs[job.id], self._by_key[key] = job, job.id
+        job.task = asyncio.ensure_future(self._run(job, fn))
+        self.submitted += 1
+        return job
+
+    async def _run(self, job: Job, fn):
+        def progress(text: str):
+            job.partial = text
+        try:
+            job.result = await fn(progress)
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status, job.error = "failed", f"{type(e).__name__}: {e}"
+        finally:
+            job.finished = time.time()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._sweep()
+        return self._jobs.get(job_id)
+
+    async def cancel(self, job: Job) -> bool:
+        """Cancel a running job and wait for it to unwind (its LLM calls cancelled, their slots released).
+        False if the job had already finished."""
+        if job.task is None or job.task.done():
+            return False
+        job.task.cancel()
+        await asyncio.wait([job.task])
+        return True
+
+    async def wait(self, job: Job, timeout: float) -> Job:
+        """Wait up to timeout seconds for job to finish (the job keeps running if the waiter is cancelled)."""
+        if job.task is not None and not job.task.done() and timeout > 0:
+            await asyncio.wait([job.task], timeout=timeout)
+        return job
+
+    def _drop(self, job: Job):
+        del self._jobs[job.id]
+        if self._by_key.get(job.key) == job.id:
+            del self._by_key[job.key]
+        self.evicted += 1
+
+    def _sweep(self):
+        cutoff = time.time() - self.ttl
+        for job in [j for j in self._jobs.values() if j.finished is not None and j.finished < cutoff]:
+            self._drop(job)
+
+    def _evict_oldest_finished(self) -> bool:
+        job = next((j for j in self._jobs.values() if j.finished is not None), None)
+        if job is not None:
+            self._drop(job)
+        return job is not None
+
+    async def close(self):
+        """Cancel running jobs and wait for them to unwind (server shutdown)."""
+        running = [j.task for j in self._jobs.values() if j.task is not None and not j.task.done()]
+        for t in running:
+            t.cancel()
+        if running:
+            await asyncio.wait(running)
+
+    def stats(self) -> Dict:
+        running = sum(j.status == "running" for j in self._jobs.values())
+        return {"running": running, "finished": len(self._jobs) - running, "submitted": self.submitted,
+                "deduped": self.deduped, "evicted": self.evicted}
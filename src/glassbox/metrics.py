@@ -0,0 +1,109 @@
+"""In-process metrics for orchestrator LLM calls — rolling latency percentiles, token and error counters."""
+
+import contextvars
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+current_tool = contextvars.ContextVar("glassbox_tool", default="direct")  # MCP tool (or entry point) a call belongs to
+QUANTILES = (50, 95, 99)
+
+
+@contextmanager
+def tool_scope(name: str):
+    """Attribute every _ask made inside this block (and tasks it spawns) to tool name."""
+    token = current_tool.set(name)
+    try:
+        yield
+    finally:
+        current_tool.reset(token)
+
+
+class RollingHistogram:
+    """Last `window` observations plus lifetime count/sum."""
+
+    def __init__(self, window: int = 1000):
+        self.values = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.values.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p: float) -> float:
+        if not self.values:
+            return 0.0
+        ordered = sorted(self.values)
+        return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+class MetricsRegistry:
+    def __init__(self, window: int = 1000):
+        self.latency: Dict[str, Dict[str, RollingHistogram]] = {
+            dim: defaultdict(lambda: RollingHistogram(window)) for dim in ("agent", "tool", "model")}
+        self.tokens = Counter()  # (agent, model, "prompt" | "completion") → tokens
+        self.calls = Counter()   # (agent, model, tool) → calls
+        self.errors = Counter()  # (agent, error class) → calls
+        self.cache_hits = Counter()  # agent → calls served from the response cache
+
+    def record(self, agent: str, model: str, latency: float, prompt_tokens: int = 0, completion_tokens: int = 0,
+               error: Optional[str] = None, cached: bool = False, tool: Optional[str] = None):
+        tool = tool or current_tool.get()
+        if not cached:  # a cache hit costs no model time; it would only drag the percentiles down
+            for dim, key in (("agent", agent), ("tool", tool), ("model", model)):
+                self.latency[dim][key].observe(latency)
+        self.calls[(agent, model, tool)] += 1
+        self.tokens[(agent, model, "prompt")] += prompt_tokens
+        self.tokens[(agent, model, "completion")] += completion_tokens
+        if error:
+            self.errors[(agent, error)] += 1
+        if cached:
+            self.cache_hits[agent] += 1
+
+    def snapshot(self) -> Dict:
+        """Percentiles (ms) per agent/tool/model, token totals per agent, and error counts."""
+        latency = {dim: {key: {"count": h.count, **{f"p{q}_ms": 1000 * h.percentile(q) for q in QUANTILES}} for key, h in hists.items()}
+                   for dim, hists in self.latency.items()}
+        tokens = defaultdict(lambda: {"prompt": 0, "completion": 0})
+        for (agent, _, kind), n in self.tokens.items():
+            tokens[agent][kind] += n
+        errors = defaultdict(dict)
+        for (agent, error), n in self.errors.items():
+            errors[agent][error] = n
+        return {"latency": latency, "tokens": dict(tokens), "errors": dict(errors), "cache_hits": dict(self.cache_hits)}
+
+    def format_text(self) -> str:
+        snap = self.snapshot()
+        lines = []
+        for dim, rows in snap["latency"].items():
+            lines.append(f"── latency by {dim} (ms) ──")
+            lines += [f"{key}: n={r['count']} p50={r['p50_ms']:.0f} p95={r['p95_ms']:.0f} p99={r['p99_ms']:.0f}" for key, r in sorted(rows.items())]
+        lines.append("── tokens by agent ──")
+        lines += [f"{a}: prompt={t['prompt']} completion={t['completion']}" for a, t in sorted(snap["tokens"].items())]
+        if snap["errors"]:
+            lines.append("── errors ──")
+            lines += [f"{a}: " + ", ".join(f"{e}={n}" for e, n in errs.items()) for a, errs in sorted(snap["errors"].items())]
+        return "\n".join(lines) if any(snap["latency"].values()) else "No LLM calls recorded yet."
+
+    def prometheus(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """Prometheus text exposition format; gauges are appended as glassbox_<name>."""
+        esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"')
+        lines = ["# TYPE glassbox_llm_latency_seconds summary"]
+        for dim, hists in self.latency.items():
+            for key, h in sorted(hists.items()):
+                label = f'{dim}="{esc(key)}"'
+                lines += [f'glassbox_llm_latency_seconds{{{label},quantile="{q / 100}"}} {h.percentile(q):.6f}' for q in QUANTILES]
+                lines += [f"glassbox_llm_latency_seconds_count{{{label}}} {h.count}", f"glassbox_llm_latency_seconds_sum{{{label}}} {h.total:.6f}"]
+        lines.append("# TYPE glassbox_llm_calls_total counter")
+        lines += [f'glassbox_llm_calls_total{{agent="{esc(a)}",model="{esc(m)}",tool="{esc(t)}"}} {n}' for (a, m, t), n in sorted(self.calls.items())]
+        lines.append("# TYPE glassbox_llm_tokens_total counter")
+        lines += [f'glassbox_llm_tokens_total{{agent="{esc(a)}",model="{esc(m)}",kind="{k}"}} {n}' for (a, m, k), n in sorted(self.tokens.items())]
+        lines.append("# TYPE glassbox_llm_errors_total counter")
+        lines += [f'glassbox_llm_errors_total{{agent="{esc(a)}",error="{esc(e)}"}} {n}' for (a, e), n in sorted(self.errors.items())]
+        lines.append("# TYPE glassbox_llm_cache_hits_total counter")
+        lines += [f'glassbox_llm_cache_hits_total{{agent="{esc(a)}"}} {n}' for a, n in sorted(self.cache_hits.items())]
+        for name, value in (gauges or {}).items():
+            lines += [f"# TYPE glassbox_{name} gauge", f"glassbox_{name} {value}"]
+        return "\n".join(lines) + "\n"
@@ -1,10 +1,22 @@
 """Multi-agent orchestrator with parallel execution and multi-round debate."""
 
 import asyncio
+import hashlib
 import json
-import os
-from openai import AsyncOpenAI
-from .trust_db import TrustDB
+import time
+import uuid
+import weakref
+from .admission import AdmissionController, AdmissionRejected
+from .backends import OpenAIBackend
+from .convergence import CONVERGENCE_THRESHOLD, converged
+from .debate_store import DebateStore
+from .hedging import HedgePolicy
+from .metrics import MetricsRegistry, current_tool
+from .response_cache import ResponseCache
+from .selection import SelectionPolicy
+from .singleflight import SingleFlight
+from .transcript import TranscriptManager, estimate_tokens
+from .trust_db import DEFAULT_NAMESPACE, AsyncTrustDB, TrustDB
 
 AGENTS = {
     "architect": ("gpt-4o", 0.3, "You are @architect. Think long-term, scalability, what breaks at scale. Talk like you're in a design review — direct, opinionated, no fluff. Reference @pragmatist/@critic by name. Agree or disagree sharply."),
@@ -16,75 +28,386 @@ ROUNDS = [
     "ROUND 2: React to others. Say 'I agree with @X' or 'I disagree with @X because'. Be sharp.",
     "ROUND 3: Final position. If you changed your mind, say CHANGED: and who influenced you. If not, say HOLDING: and why.",
 ]
+FOLLOW_UP_ROUND = "ROUND {n}: Follow-up — {followup} React to it and to the others. If it changes your position, say CHANGED: and why; if not, say HOLDING: and why."
 EMOJIS = {"architect": "🔵", "pragmatist": "🟢", "critic": "🟡"}
+MAX_FOLLOW_UP_ROUNDS = 3  # debate_continue clamps rounds to 1..this
+DIGEST_TOKENS = 150  # cap for each older round's digest in debate prompts; None = full verbatim history
+
+
+def failed(text):
+    """True for the placeholder _ask returns instead of an answer (error, timeout, admission rejection)."""
+    return text.startswith(("[ERROR", "[RETRY LATER"))
+
+
+async def _cancel_all(tasks):
+    """Cancel tasks and wait until they have unwound, so their admission slots and HTTP streams are released
+    by the time the caller moves on (or re-raises its own cancellation)."""
+    tasks = [t for t in tasks if not t.done()]
+    for t in tasks:
+        t.cancel()
+    if tasks:
+        await asyncio.wait(tasks)
 
 
 class MultiAgentOrchestrator:
-    def __init__(self):
-        self.trust_db = TrustDB()
-        self._client = None
+    def __init__(self, cache_path="response_cache.db", admission=None, hedging=None, backend=None, trust_db=None, debate_path="debates.db",
+                 selection=None):
+        self.trust_db = trust_db or TrustDB()
+        self.cache = ResponseCache(cache_path) if cache_path else None
+        self.debates = DebateStore(debate_path) if debate_path else None  # finished debates, continued by ID
+        self._debate_locks = weakref.WeakValueDictionary()
+        self.admission = admission or AdmissionController()
+        self.hedging = hedging or HedgePolicy()
+        self.metrics = MetricsRegistry()
+        self.backend = backend or OpenAIBackend()
+        self.flights = SingleFlight()  # identical concurrent _ask / execute / debate calls share one run
+        self.selection = selection or SelectionPolicy()
 
     @property
-    def client(self):
-        if self._client is None:
-            self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        return self._client
+    def trust_db(self) -> TrustDB:
+        return self.trust.db
+
+    @trust_db.setter
+    def trust_db(self, db: TrustDB):
+        """Assigning a TrustDB routes the orchestrator's trust I/O through a fresh AsyncTrustDB over it."""
+        self.trust = AsyncTrustDB(db)
+
+    async def _complete(self, model, temp, system, user_msg, admitted=None):
+        """One backend call inside an admission slot; successful latencies feed self.hedging.latency.
+        admitted (the primary of a hedged call) is set once the slot is held, and if that call is then cancelled,
+        e.g. by losing the hedge race, its elapsed time is still recorded so slow samples aren't dropped."""
+        async with self.admission.slot(model, estimate_tokens(system + user_msg) + 400):
+            start = time.monotonic()
+            if admitted is not None:
+                admitted.set()
+            try:
+                c = await self.backend.complete(model, temp, 400, [{"role": "system", "content": system}, {"role": "user", "content": user_msg}])
+            except asyncio.CancelledError:
+                if admitted is not None:
+                    self.hedging.latency.record(model, time.monotonic() - start)
+                raise
+        self.hedging.latency.record(model, time.monotonic() - start)
+        return c
+
+    async def _hedged(self, model, temp, system, user_msg):
+        """Call model; if it runs past its tracked latency percentile, race a duplicate on the fallback model.
+        The hedge clock starts when the primary holds its admission slot (the tracked latency excludes queueing),
+        and no duplicate is sent while other calls wait for admission: the limiter, not the model, is slow then."""
+        self.hedging.calls += 1
+        admitted = asyncio.Event()
+        primary = asyncio.ensure_future(self._complete(model, temp, system, user_msg, admitted))
+        delay = self.hedging.hedge_after(model)
+        done, pending = set(), {primary}
+        try:
+            if delay is not None:
+                gate = asyncio.ensure_future(admitted.wait())
+                try:
+                    await asyncio.wait({primary, gate}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    gate.cancel()
+                done, pending = await asyncio.wait(pending, timeout=delay)
+                if not done and not self.admission.waiting:
+                    self.hedging.hedged += 1
+                    pending.add(asyncio.ensure_future(self._complete(self.hedging.fallback[model], temp, system, user_msg)))
+            while True:
+                if not done:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if not t.cancelled() and t.exception() is None), None)
+                if winner is not None:
+                    self.hedging.hedge_wins += winner is not primary
+                    return winner.result()
+                if not pending:
+                    return primary.result()  # every attempt failed: surface the primary's error
+                done = set()
+        finally:
+            await _cancel_all(pending)  # the losing (or abandoned) attempt gives back its admission slot before we return
+
+    async def _ask(self, agent, system, user_msg, use_cache=True, stats=None):
+        """_answer's text only."""
+        return (await self._answer(agent, system, user_msg, use_cache, stats))[0]
 
-    async def _ask(self, agent, system, user_msg):
+    async def _answer(self, agent, system, user_msg, use_cache=True, stats=None):
+        """One completion for agent, as (text, model that answered). Successful answers from the agent's own model
+        are cached by (model, temperature, system, user_msg); a hedged fallback's answer is not.
+        use_cache=False bypasses the cache. Hits/misses are counted into stats when given.
+        API calls go through the admission controller; a rejection comes back as a [RETRY LATER] result.
+        Each call has a per-agent deadline and may be hedged onto a fallback model (see HedgePolicy).
+        Latency, tokens, answering model and error class are recorded in self.metrics.
+        With use_cache, a call identical to one already in flight waits on that one (self.flights) instead of
+        sending its own; its tokens are counted once, on the caller that sent it."""
+        start, model, error, result, hit = time.monotonic(), AGENTS.get(agent, ("unknown",))[0], None, None, False
         try:
             model, temp, _ = AGENTS[agent]
-            r = await self.client.chat.completions.create(model=model, temperature=temp, max_tokens=400, messages=[{"role": "system", "content": system}, {"role": "user", "content": user_msg}])
-            return r.choices[0].message.content
+            flight = ResponseCache.key(model, temp, system, user_msg) if use_cache else None
+            key = flight if self.cache is not None else None
+            cached = await asyncio.to_thread(self.cache.get, key) if key else None  # sqlite stays off the event loop
+            if stats is not None and key:
+                stats["hits" if cached is not None else "misses"] += 1
+            if cached is not None:
+                hit = True
+                return cached, model
+            deadline = self.hedging.deadline_for(agent)
+            try:
+                c, shared = await asyncio.wait_for(self.flights.do(flight, lambda: self._hedged(model, temp, system, user_msg)), deadline)
+            except asyncio.TimeoutError:
+                self.hedging.timeouts += 1
+                error = "TimeoutError"
+                return f"[ERROR: {agent} timed out after {deadline:g}s]", model
+            if key and not shared and c.model == model:
+                await asyncio.to_thread(self.cache.put, key, c.text)
+            result, model = (None if shared else c), c.model
+            return c.text, model
+        except AdmissionRejected as e:
+            error = "AdmissionRejected"
+            return f"[RETRY LATER: {agent} not admitted — {e}]", model
+        except asyncio.CancelledError:
+            error = "CancelledError"
+            raise
         except Exception as e:
-            return f"[ERROR: {agent} failed — {type(e).__name__}: {e}]"
+            error = type(e).__name__
+            return f"[ERROR: {agent} failed — {type(e).__name__}: {e}]", model
+        finally:
+            self.metrics.record(agent, model, time.monotonic() - start, result.prompt_tokens if result else 0,
+                                result.completion_tokens if result else 0, error, cached=hit)
+
+    def _select(self, agents, trust, explicit):
+        """self.selection applied to the default panel; an agent list the caller named is always queried in full."""
+        if explicit or self.selection.top_k is None:
+            return {"chosen": agents, "skipped": [], "explored": None}
+        return self.selection.select(agents, trust, current_tool.get())
 
     # ── V1: parallel single-shot ──
 
-    async def execute(self, task, agent_names=None):
-        agents = agent_names or list(AGENTS.keys())
-        async def run(a): return {"agent": a, "response": await self._ask(a, AGENTS[a][2], task), "trust": self.trust_db.get_trust(a), "model": AGENTS[a][0]}
-        responses = [r for r in await asyncio.gather(*[run(a) for a in agents if a in AGENTS], return_exceptions=True) if not isinstance(r, Exception)]
+    @staticmethod
+    def build_result(responses, stats):
         if not responses:
-            return {"agent_responses": [], "consensus": "All agents failed.", "trust_scores": {}}
-        best = max(responses, key=lambda r: r["trust"])
-        return {"agent_responses": responses, "consensus": best["response"], "trust_scores": {r["agent"]: r["trust"] for r in responses}}
+            return {"agent_responses": [], "consensus": "All agents failed.", "trust_scores": {}, "cache": stats}
+        best = max([r for r in responses if not failed(r["response"])] or responses, key=lambda r: r["trust"])
+        return {"agent_responses": responses, "consensus": best["response"], "trust_scores": {r["agent"]: r["trust"] for r in responses}, "cache": stats}
+
+    async def execute(self, task, agent_names=None, use_cache=True, namespace=DEFAULT_NAMESPACE):
+        """All agents on task at once (without agent_names: the agents self.selection picks, see result["selection"]).
+        With use_cache, concurrent identical calls share one run and its result."""
+        agents = [a for a in (agent_names or list(AGENTS.keys())) if a in AGENTS]
+        key = ("execute", task, tuple(agents), agent_names is None, namespace) if use_cache else None
+        result, _ = await self.flights.do(key, lambda: self._execute(task, agents, use_cache, namespace, agent_names is not None))
+        return dict(result)
+
+    async def _execute(self, task, agents, use_cache, namespace, explicit):
+        stats = {"hits": 0, "misses": 0}
+        trust = await self.trust.get_trust_many(agents, namespace)
+        selection = self._select(agents, trust, explicit)
+        async def run(a):
+            text, model = await self._answer(a, AGENTS[a][2], task, use_cache, stats)
+            return {"agent": a, "response": text, "trust": trust[a], "model": model}
+        responses = [r for r in await asyncio.gather(*[run(a) for a in selection["chosen"]], return_exceptions=True) if isinstance(r, dict)]
+        return {**self.build_result(responses, stats), "selection": selection}
+
+    async def execute_stream(self, task, agent_names=None, use_cache=True, early_return=False, stats=None, namespace=DEFAULT_NAMESPACE):
+        """Yield each agent response as it completes. early_return=True declares consensus as soon as the
+        highest-trust agent has answered successfully and cancels the slower agents still running; if the leader
+        fails (error, timeout, rejection) every other agent is still collected. Without agent_names,
+        only the agents self.selection picks are asked."""
+        agents = [a for a in (agent_names or list(AGENTS.keys())) if a in AGENTS]
+        trust = await self.trust.get_trust_many(agents, namespace)
+        agents = self._select(agents, trust, agent_names is not None)["chosen"]
+        leader = max(agents, key=trust.get) if agents else None
+        async def run(a):
+            text, model = await self._answer(a, AGENTS[a][2], task, use_cache, stats)
+            return {"agent": a, "response": text, "trust": trust[a], "model": model}
+        pending = [asyncio.ensure_future(run(a)) for a in agents]
+        try:
+            for next_done in asyncio.as_completed(pending):
+                r = await next_done
+                yield r
+                if early_return and r["agent"] == leader and not failed(r["response"]):
+                    return
+        finally:
+            await _cancel_all(pending)
+
+    async def execute_many(self, tasks, agent_names=None, max_concurrency=8, sink=None, use_cache=True, namespace=DEFAULT_NAMESPACE):
+        """Run every (task, agent) pair through one pool of max_concurrency workers against a single TrustDB
+        snapshot. Results are returned in task order and, if sink is given, written to it as JSONL in order
+        as soon as each prefix of the batch is complete."""
+        agents = [a for a in (agent_names or list(AGENTS.keys())) if a in AGENTS]
+        trust = await self.trust.get_trust_many(agents, namespace)
+        slots = [{"responses": {}, "models": {}, "stats": {"hits": 0, "misses": 0}} for _ in tasks]
+        results, flushed = [None] * len(tasks), 0
+        queue = asyncio.Queue()
+        for i in range(len(tasks)):
+            for a in agents:
+                queue.put_nowait((i, a))
+
+        def finish(i):
+            nonlocal flushed
+            slot = slots[i]
+            responses = [{"agent": a, "response": slot["responses"][a], "trust": trust[a], "model": slot["models"][a]} for a in agents]
+            results[i] = {"task": tasks[i], **self.build_result(responses, slot["stats"])}
+            while flushed < len(results) and results[flushed] is not None:
+                if sink is not None:
+                    sink.write(json.dumps(results[flushed], ensure_ascii=False) + "\n")
+                flushed += 1
 
-    async def execute_formatted(self, task, agent_names=None):
-        result = await self.execute(task, agent_names)
+        async def worker():
+            while not queue.empty():
+                i, a = queue.get_nowait()
+                slots[i]["responses"][a], slots[i]["models"][a] = await self._answer(a, AGENTS[a][2], tasks[i], use_cache, slots[i]["stats"])
+                if len(slots[i]["responses"]) == len(agents):
+                    finish(i)
+
+        if not agents:
+            for i in range(len(tasks)):
+                finish(i)
+        await asyncio.gather(*[worker() for _ in range(max(1, min(max_concurrency, queue.qsize())))])
+        if sink is not None and hasattr(sink, "flush"):
+            sink.flush()
+        return results
+
+    @staticmethod
+    def format_result(task, result):
         lines = [f"Task: {task}\n"] + [f"@{r['agent']} (trust:{r['trust']:.2f}):\n{r['response']}\n" for r in result["agent_responses"]]
-        return "\n".join(lines + [f"--- Consensus (highest trust) ---\n{result['consensus']}"])
+        cache = f"\n--- Cache: {result['cache']['hits']} hit(s), {result['cache']['misses']} miss(es) ---"
+        skipped = result.get("selection", {}).get("skipped")
+        if skipped:
+            cache += f"\n--- Skipped (below trust cut): {', '.join('@' + a for a in skipped)} ---"
+        return "\n".join(lines + [f"--- Consensus (highest trust) ---\n{result['consensus']}" + cache])
+
+    async def execute_formatted(self, task, agent_names=None, use_cache=True, namespace=DEFAULT_NAMESPACE):
+        return self.format_result(task, await self.execute(task, agent_names, use_cache, namespace))
 
     # ── V2: multi-round debate (the 20 lines) ──
 
-    async def debate(self, task, agents=None):
-        agents = [a for a in (agents or list(AGENTS.keys())) if a in AGENTS]
-        log, out = [], [f"━━ TOPIC ━━\n{task}\n"]
+    async def debate(self, task, agents=None, parallel=False, digest_tokens=DIGEST_TOKENS, use_cache=True,
+                     adaptive=False, threshold=CONVERGENCE_THRESHOLD, namespace=DEFAULT_NAMESPACE, progress=None):
+        """Run ROUNDS of debate. parallel=True runs each round as one gather wave: every agent sees only earlier rounds.
+        Rounds older than the latest one enter prompts as a cached digest capped at digest_tokens.
+        adaptive=True skips the remaining rounds once a round's positions converge (local similarity, no LLM call).
+        Without an agents list, the panel is the agents self.selection picks by trust.
+        Trust is read from and credited to namespace. With use_cache, concurrent identical debates share one run:
+        one set of LLM calls, one set of trust updates, the same transcript for every caller.
+        progress(text), if given, receives the transcript so far after every round (the caller that starts a shared run reports)."""
+        explicit, agents = agents is not None, [a for a in (agents or list(AGENTS.keys())) if a in AGENTS]
+        key = ("debate", task, tuple(agents), explicit, parallel, digest_tokens, adaptive, threshold, namespace) if use_cache else None
+        result, _ = await self.flights.do(key, lambda: self._debate(task, agents, explicit, parallel, digest_tokens, use_cache, adaptive, threshold, namespace, progress))
+        return result
+
+    async def _debate(self, task, agents, explicit, parallel, digest_tokens, use_cache, adaptive, threshold, namespace, progress):
+        ts, out, labels = TranscriptManager(EMOJIS, digest_tokens), [f"━━ TOPIC ━━\n{task}\n"], []
+        if not explicit and self.selection.top_k is not None:
+            selection = self._select(agents, await self.trust.get_trust_many(agents, namespace), False)
+            agents = selection["chosen"]
+            if selection["skipped"]:
+                explored = f"; exploring @{selection['explored']}" if selection["explored"] else ""
+                out.append(f"━━ PANEL ━━\n{' '.join('@' + a for a in agents)} (top {self.selection.top_k} by trust{explored}; "
+                           f"skipped {' '.join('@' + a for a in selection['skipped'])})\n")
         for i, rd in enumerate(ROUNDS):
-            out.append(f"━━ {rd.split(':')[0]} ━━\n")
+            await self._round(task, agents, rd, ts, out, parallel, use_cache, namespace)
+            labels.append(rd)
+            if progress is not None:
+                progress("\n".join(out))
+            if adaptive and i < len(ROUNDS) - 1:
+                done, score = converged([e["t"] for e in ts.rounds[-1]], threshold)
+                if done:
+                    skipped = len(ROUNDS) - 1 - i
+                    # Each skipped turn would have re-sent at least this round's prompt plus the round's replies, and replied.
+                    replies = sum(estimate_tokens(e["t"]) for e in ts.rounds[-1])
+                    saved = skipped * sum(e["p"] + replies + estimate_tokens(e["t"]) for e in ts.rounds[-1])
+                    out.append(f"━━ EARLY STOP ━━\nPositions converged (similarity {score:.2f}) — ran {i + 1}/{len(ROUNDS)} rounds, ~{saved} tokens saved\n")
+                    break
+        summary = await self._conclude(task, agents, ts.full(), len(ts.rounds), out, use_cache, namespace)
+        state = {"task": task, "agents": agents, "namespace": namespace, "parallel": parallel, "labels": labels, "summary": summary}
+        await self._store_debate(uuid.uuid4().hex[:12], state, ts, out)
+        return "\n".join(out)
+
+    async def debate_continue(self, debate_id, followup, rounds=1, parallel=None, use_cache=True, progress=None):
+        """Add `rounds` follow-up rounds to a stored debate, then re-summarize and judge the newest round.
+        The stored transcript is reloaded as-is: older rounds enter prompts through their cached digests and only
+        the latest round verbatim, so a follow-up costs its own rounds plus one summary/judge wave instead of a
+        full re-run. rounds is clamped to 1..MAX_FOLLOW_UP_ROUNDS. parallel=None keeps the stored debate's mode.
+        Raises KeyError for an unknown or expired ID."""
+        if self.debates is None:
+            raise KeyError(debate_id)
+        rounds = min(max(rounds, 1), MAX_FOLLOW_UP_ROUNDS)
+        key = ("continue", debate_id, followup, rounds, parallel) if use_cache else None
+        result, _ = await self.flights.do(key, lambda: self._continue(debate_id, followup, rounds, parallel, use_cache, progress))
+        return result
+
+    async def _continue(self, debate_id, followup, rounds, parallel, use_cache, progress):
+        async with self._debate_locks.setdefault(debate_id, asyncio.Lock()):  # one continuation of a debate at a time
+            state = await asyncio.to_thread(self.debates.load, debate_id)
+            if state is None:
+                raise KeyError(debate_id)
+            ts = TranscriptManager.from_state(EMOJIS, state["transcript"])
+            task, agents, namespace = state["task"], [a for a in state["agents"] if a in AGENTS], state["namespace"]
+            parallel = state["parallel"] if parallel is None else parallel
+            out = [f"━━ TOPIC ━━\n{task}\n", f"━━ FOLLOW-UP ━━\n{followup}\n"]
+            for _ in range(rounds):
+                rd = FOLLOW_UP_ROUND.format(n=len(ts.rounds) + 1, followup=followup)
+                await self._round(task, agents, rd, ts, out, parallel, use_cache, namespace)
+                state["labels"].append(rd)
+                if progress is not None:
+                    progress("\n".join(out))
+            state["summary"] = await self._conclude(f"{task}\nFollow-up: {followup}", agents, ts.render(), len(ts.rounds), out, use_cache, namespace)
+            await self._store_debate(debate_id, state, ts, out)
+        return "\n".join(out)
+
+    async def _store_debate(self, debate_id, state, ts, out):
+        if self.debates is not None:
+            await asyncio.to_thread(self.debates.save, debate_id, {**state, "transcript": ts.state()})
+            out.append(f"\n━━ DEBATE {debate_id} ━━ (add rounds with debate_continue)")
+
+    async def _round(self, task, agents, rd, ts, out, parallel, use_cache, namespace):
+        """One debate round on ts: parallel=True asks every agent at once, otherwise in turn so later agents see earlier replies."""
+        prompt = lambda a, history: f"TASK: {task}\n\nConversation so far:\n{history}\n\n{rd}\n\nRespond as @{a}:"
+        out.append(f"━━ {rd.split(':')[0]} ━━\n")
+        ts.start_round()
+        if parallel:
+            history = ts.render()
+            prompts = [prompt(a, history) for a in agents]
+            answers = await asyncio.gather(*[self._answer(a, AGENTS[a][2], p, use_cache) for a, p in zip(agents, prompts)])
+            for a, p, (t, m) in zip(agents, prompts, answers):
+                ts.add(a, t, estimate_tokens(AGENTS[a][2] + p), m)
+        else:
             for a in agents:
-                history = "\n".join(f"{EMOJIS[e['a']]} @{e['a']}: {e['t']}" for e in log) if log else "(no prior messages)"
-                text = await self._ask(a, AGENTS[a][2], f"TASK: {task}\n\nConversation so far:\n{history}\n\n{rd}\n\nRespond as @{a}:")
-                log.append({"a": a, "r": i, "t": text})
-                out.append(f"{EMOJIS[a]} @{a} [{AGENTS[a][0]}] (trust:{self.trust_db.get_trust(a):.2f}):\n{text}\n")
-        transcript = "\n".join(f"@{e['a']}: {e['t']}" for e in log)
-        summary = await self._ask("architect", "Summarize this debate into a converged action plan. Be concise.", f"Task: {task}\n\n{transcript}\n\nConverged action plan:")
-        out.append(f"━━ CONVERGENCE ━━\n{summary}")
-        out.append("\n━━ TRUST UPDATES ━━")
-        judge_prompt = ("Analyze Round 3 of this debate. For each agent, output ONLY valid JSON: "
+                p = prompt(a, ts.render())
+                t, m = await self._answer(a, AGENTS[a][2], p, use_cache)
+                ts.add(a, t, estimate_tokens(AGENTS[a][2] + p), m)
+        trust = await self.trust.get_trust_many(agents, namespace)
+        for e in ts.rounds[-1]:
+            out.append(f"{EMOJIS[e['a']]} @{e['a']} [{e.get('m') or AGENTS[e['a']][0]}] (trust:{trust[e['a']]:.2f} · prompt≈{e['p']} tok):\n{e['t']}\n")
+
+    async def _conclude(self, task, agents, transcript, last_round, out, use_cache, namespace):
+        """Summary plus judge over transcript, then credit every persuasion the judge found in last_round. Returns the summary.
+        Crediting is recorded per (namespace, transcript) in the trust DB, so replaying an identical transcript in the
+        same namespace changes no trust, while the first run in another namespace is credited there."""
+        judge_prompt = (f"Analyze Round {last_round} of this debate. For each agent, output ONLY valid JSON: "
             '{"agent_name": {"changed_mind": bool, "influenced_by": "agent_name"|null}}. '
             "changed_mind=true ONLY if they genuinely adopted another agent's position. Ignore sarcasm or lip service.")
-        judge_resp = await self._ask("architect", judge_prompt, f"Debate transcript:\n{transcript}")
+        # Summary and judge both depend only on the final transcript — run them as one wave.
+        summary, judge_resp = await asyncio.gather(
+            self._ask("architect", "Summarize this debate into a converged action plan. Be concise.", f"Task: {task}\n\n{transcript}\n\nConverged action plan:", use_cache),
+            self._ask("architect", judge_prompt, f"Debate transcript:\n{transcript}", use_cache))
+        out.append(f"━━ CONVERGENCE ━━\n{summary}")
+        out.append("\n━━ TRUST UPDATES ━━")
         try:
             verdicts = json.loads(judge_resp.strip().strip("`").strip("json").strip())
+            persuaders = [v["influenced_by"] for v in verdicts.values() if v.get("changed_mind") and v.get("influenced_by") in agents]
+            # One read + one transaction for every persuasion: all of the judge's updates land or none do. A cancel
+            # arriving here either dequeues the transaction before it starts or lets it commit whole on the trust thread.
+            current = await self.trust.get_trust_many(persuaders, namespace)
+            key = hashlib.sha256(f"{judge_prompt}\n{transcript}".encode()).hexdigest()
+            new_scores = await self.trust.credit_once(key, [(p, True) for p in persuaders], namespace)
+            if new_scores is None:
+                out.append("  ♻️ Same transcript as an earlier debate — trust already credited in this namespace, no change")
+                return summary
+            new_scores = iter(new_scores)
             for agent_name, v in verdicts.items():
                 if v.get("changed_mind") and v.get("influenced_by") in agents:
-                    persuader = v["influenced_by"]
-                    old = self.trust_db.get_trust(persuader)
-                    self.trust_db.update_trust(persuader, True)
-                    new = self.trust_db.get_trust(persuader)
-                    out.append(f"  📊 @{persuader} {old:.2f} → {new:.2f} ↑ (persuaded @{agent_name})")
+                    persuader, new = v["influenced_by"], next(new_scores)
+                    out.append(f"  📊 @{persuader} {current[persuader]:.2f} → {new:.2f} ↑ (persuaded @{agent_name})")
+                    current[persuader] = new
                 elif not v.get("changed_mind"):
                     out.append(f"  📊 @{agent_name} — HELD position (no trust change)")
         except (json.JSONDecodeError, KeyError, AttributeError):
             out.append("  ⚠️ Could not parse trust verdicts from judge")
-        return "\n".join(out)
+        return summary
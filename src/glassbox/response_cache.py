@@ -0,0 +1,68 @@
+"""SQLite-backed, content-addressed LLM response cache with TTL and LRU eviction."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class ResponseCache:
+    """One long-lived WAL-mode connection behind a lock. Methods block on SQLite, so async callers
+    run them on a worker thread (the orchestrator uses asyncio.to_thread)."""
+
+    def __init__(self, db_path: str = "response_cache.db", ttl: float = 24 * 3600, max_entries: int = 2000):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_db()
+
+    def _init_db(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed)")
+
+    @staticmethod
+    def key(model: str, temperature: float, system: str, user_msg: str) -> str:
+        return hashlib.sha256(json.dumps([model, temperature, system, user_msg]).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response, or None if missing or older than ttl. A hit refreshes its LRU position."""
+        now = time.time()
+        with self._lock, self._conn:
+            result = self._conn.execute("SELECT response FROM responses WHERE key = ? AND created > ?", (key, now - self.ttl)).fetchone()
+            if result:
+                self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return result[0] if result else None
+
+    def put(self, key: str, response: str):
+        """Store a response, then drop expired rows and the least recently used ones beyond max_entries."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO responses (key, response, created, accessed) VALUES (?, ?, ?, ?)", (key, response, now, now))
+            self._conn.execute("DELETE FROM responses WHERE created <= ?", (now - self.ttl,))
+            self._conn.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
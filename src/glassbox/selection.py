@@ -0,0 +1,44 @@
+"""Trust-ranked agent selection: query only the top-k agents of a panel, exploring a low-trust one now and then."""
+
+import logging
+import random
+from typing import Dict, Optional, Sequence
+
+logger = logging.getLogger("glassbox.selection")
+
+
+class SelectionPolicy:
+    """top_k=None queries every agent. Otherwise the top_k agents by trust are chosen, and with probability
+    explore the lowest-ranked chosen slot goes to a random agent from below the cut instead, so agents that
+    lost trust can still be heard and earn it back. Every choice is counted (stats()) and logged to
+    glassbox.selection, so the calls saved can be set against any change in consensus quality."""
+
+    def __init__(self, top_k: Optional[int] = None, explore: float = 0.0, seed: Optional[int] = None):
+        self.top_k = top_k
+        self.explore = explore
+        self.rng = random.Random(seed)
+        self.selections = self.explorations = self.skipped = 0
+
+    def select(self, agents: Sequence[str], trust: Dict[str, float], tool: str = "direct") -> Dict:
+        """{"chosen", "skipped", "explored"} for a panel; chosen keeps the panel's order. tool labels the log line."""
+        ranked = sorted(agents, key=lambda a: (-trust[a], a))
+        if self.top_k is None or len(ranked) <= self.top_k:
+            picked, explored = ranked, None
+        else:
+            picked, rest = ranked[:max(self.top_k, 1)], ranked[max(self.top_k, 1):]
+            explored = self.rng.choice(rest) if self.explore > 0 and self.rng.random() < self.explore else None
+            if explored is not None:
+                picked[-1] = explored
+        chosen = [a for a in agents if a in picked]
+        skipped = [a for a in agents if a not in picked]
+        self.selections += 1
+        self.explorations += explored is not None
+        self.skipped += len(skipped)
+        if skipped:
+            logger.info("tool=%s chose %s skipped %s explored %s (trust %s)", tool, chosen, skipped, explored,
+                        {a: round(trust[a], 3) for a in agents})
+        return {"chosen": chosen, "skipped": skipped, "explored": explored}
+
+    def stats(self) -> Dict:
+        return {"top_k": self.top_k or 0, "explore": self.explore, "selections": self.selections,  # top_k 0 = every agent
+                "explorations": self.explorations, "calls_skipped": self.skipped}
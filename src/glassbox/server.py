@@ -1,54 +1,283 @@
 """GlassBox AI — Multi-agent MCP server with trust scoring."""
 
-import os, subprocess
+import argparse, asyncio, atexit, os, subprocess, sys, threading, time
+from contextlib import asynccontextmanager
 from typing import Optional
-from mcp.server.fastmcp import FastMCP
-from .orchestrator import MultiAgentOrchestrator
-
-# Read API key: Keychain first, then env var
-try:
-    os.environ["OPENAI_API_KEY"] = subprocess.run(
-        ["security", "find-generic-password", "-s", "OPENAI_API_KEY", "-a", "glassbox-ai", "-w"],
-        capture_output=True, text=True, check=True
-    ).stdout.strip()
-except Exception:
-    pass  # fall back to env var
-
+from mcp.server.fastmcp import Context, FastMCP
 from . import __version__
-mcp = FastMCP(f"GlassBox AI v{__version__}")
-orch = MultiAgentOrchestrator()
+from .jobs import JobManager, JobTableFull
+from .hedging import HedgePolicy
+from .metrics import tool_scope
+from .orchestrator import AGENTS, MultiAgentOrchestrator
+from .selection import SelectionPolicy
+from .trust_db import DEFAULT_NAMESPACE, TrustDB
+
+# Built on first use (first tool call, or the post-start warm-up), not at import: the stdio handshake
+# shouldn't wait on the keychain, SQLite setup or openai.
+orch: Optional[MultiAgentOrchestrator] = None
+_orch_lock = threading.Lock()
+
+
+def _load_api_key():
+    """Keychain first (macOS only), then the OPENAI_API_KEY env var."""
+    if sys.platform != "darwin":
+        return
+    try:
+        os.environ["OPENAI_API_KEY"] = subprocess.run(
+            ["security", "find-generic-password", "-s", "OPENAI_API_KEY", "-a", "glassbox-ai", "-w"],
+            capture_output=True, text=True, check=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        pass  # fall back to env var
+
+
+def get_orch() -> MultiAgentOrchestrator:
+    global orch
+    with _orch_lock:
+        if orch is None:
+            _load_api_key()
+            # GLASSBOX_TRUST_WRITE_BACK=1 serves trust reads from memory and flushes updates in batches (and on exit).
+            # GLASSBOX_TOP_K=k asks only the k highest-trust agents of the default panel, GLASSBOX_EXPLORE=p lets a
+            # lower-trust agent take the last slot with probability p. GLASSBOX_HEDGE=1 sends slow calls a duplicate
+            # to the model's fallback (HEDGE_FALLBACK).
+            top_k = int(os.getenv("GLASSBOX_TOP_K", "0")) or None
+            orch = MultiAgentOrchestrator(trust_db=TrustDB(write_back=os.getenv("GLASSBOX_TRUST_WRITE_BACK") == "1"),
+                                          selection=SelectionPolicy(top_k, float(os.getenv("GLASSBOX_EXPLORE", "0"))),
+                                          hedging=HedgePolicy(enabled=os.getenv("GLASSBOX_HEDGE") == "1"))
+            atexit.register(orch.trust.close)  # tools await orch.trust, which keeps sqlite I/O off the event loop
+        return orch
+
+
+async def _warm_up():
+    """Build the orchestrator on a worker thread, then open the LLM connection, while the loop serves the handshake."""
+    try:
+        o = await asyncio.to_thread(get_orch)
+        await o.backend.warm()
+    except Exception:
+        pass  # the first tool call will surface the error
+
+
+_warm_task: Optional[asyncio.Task] = None
+jobs = JobManager()  # background debates; per process, so with --workers > 1 a job ID only resolves on the worker that took it
+
+
+def _start_warm_up():
+    """Start the background warm-up once per process (GLASSBOX_PREWARM=0 disables it)."""
+    global _warm_task
+    if _warm_task is None and os.getenv("GLASSBOX_PREWARM", "1") != "0":
+        _warm_task = asyncio.create_task(_warm_up())
+
+
+@asynccontextmanager
+async def lifespan(server):
+    """Runs per MCP session (per request with stateless HTTP)."""
+    _start_warm_up()
+    yield
+
+
+async def _shutdown():
+    """Graceful stop, after in-flight requests have drained: cancel background jobs, close the LLM client, response cache
+    and debate store, flush and close the trust store."""
+    if _warm_task is not None:
+        _warm_task.cancel()
+    await jobs.close()
+    if orch is not None:
+        await orch.backend.aclose()
+        if orch.cache is not None:
+            await asyncio.to_thread(orch.cache.close)
+        if orch.debates is not None:
+            await asyncio.to_thread(orch.debates.close)
+        await asyncio.to_thread(orch.trust.close)
+
+
+mcp = FastMCP(f"GlassBox AI v{__version__}", lifespan=lifespan)
 
 
 @mcp.tool()
-async def analyze(task: str, agents: Optional[str] = None) -> str:
-    """Run multiple AI agents on a task with trust-weighted consensus."""
+async def analyze(task: str, agents: Optional[str] = None, no_cache: bool = False, early_return: bool = False,
+                  namespace: str = DEFAULT_NAMESPACE, ctx: Optional[Context] = None) -> str:
+    """Run multiple AI agents on a task with trust-weighted consensus. Each answer is streamed as a progress notification as it lands.
+    no_cache=True skips the response cache. early_return=True stops once the highest-trust agent answers and cancels slower agents.
+    namespace selects whose trust scores (repository or team) weight the consensus."""
     agent_list = [a.strip() for a in agents.split(",")] if agents else None
-    return await orch.execute_formatted(task, agent_list)
+    stats, responses, o = {"hits": 0, "misses": 0}, [], get_orch()
+    total = len([a for a in (agent_list or AGENTS) if a in AGENTS])
+    if agent_list is None and o.selection.top_k:
+        total = min(total, o.selection.top_k)
+    with tool_scope("analyze"):
+        async for r in o.execute_stream(task, agent_list, not no_cache, early_return, stats, namespace):
+            responses.append(r)
+            if ctx is not None:
+                await ctx.report_progress(len(responses), total, f"@{r['agent']} (trust:{r['trust']:.2f}): {r['response'][:200]}")
+    return o.format_result(task, o.build_result(responses, stats))
+
+
+@mcp.tool()
+async def debate(task: str, parallel: bool = True, no_cache: bool = False, adaptive: bool = False, namespace: str = DEFAULT_NAMESPACE) -> str:
+    """Run a multi-round debate between agents. They talk TO each other across 3 rounds: Position → Reaction → Convergence. Trust auto-updates based on who persuades whom. parallel=True runs each round as one concurrent wave (agents see earlier rounds only); parallel=False lets each agent see same-round replies. no_cache=True skips the response cache. adaptive=True stops early once positions converge. Trust updates go to namespace."""
+    with tool_scope("debate"):
+        return await get_orch().debate(task, parallel=parallel, use_cache=not no_cache, adaptive=adaptive, namespace=namespace)
+
+
+@mcp.tool()
+async def debate_continue(debate_id: str, followup: str, rounds: int = 1, no_cache: bool = False) -> str:
+    """Add follow-up round(s) to a finished debate, by the ID printed at the end of its transcript. Earlier rounds
+    are carried over as cached digests, so a follow-up costs its own rounds (at most 3) plus one summary, not a re-run."""
+    with tool_scope("debate"):
+        try:
+            return await get_orch().debate_continue(debate_id, followup, rounds=rounds, use_cache=not no_cache)
+        except KeyError:
+            return f"No debate {debate_id} (unknown or expired)."
+
+
+def _job_line(job) -> str:
+    snap = job.snapshot()
+    return f"Job {snap['id']}: {snap['status']} ({snap['elapsed']:.0f}s)" + (f" — {snap['error']}" if snap["error"] else "")
+
+
+@mcp.tool()
+async def debate_submit(task: str, parallel: bool = True, no_cache: bool = False, adaptive: bool = False, namespace: str = DEFAULT_NAMESPACE) -> str:
+    """Start a debate in the background and return its job ID immediately; poll debate_status and fetch debate_result.
+    Submitting the same debate again while it runs (or, unless no_cache, while its result is kept) returns the same job."""
+    o = get_orch()
+    run = lambda progress: o.debate(task, parallel=parallel, use_cache=not no_cache, adaptive=adaptive, namespace=namespace, progress=progress)
+    with tool_scope("debate"):  # the job task inherits the scope, so its LLM calls count under debate
+        try:
+            job = jobs.submit(("debate", task, parallel, no_cache, adaptive, namespace), run, reuse_result=not no_cache)
+        except JobTableFull as e:
+            return f"[RETRY LATER: {e}]"
+    return _job_line(job)
+
+
+@mcp.tool()
+def debate_status(job_id: str) -> str:
+    """Status of a background debate plus its transcript so far (updated after every round)."""
+    job = jobs.get(job_id)
+    if job is None:
+        return f"No job {job_id} (unknown or expired)."
+    return "\n".join(filter(None, [_job_line(job), job.partial]))
 
 
 @mcp.tool()
-async def debate(task: str) -> str:
-    """Run a multi-round debate between agents. They talk TO each other across 3 rounds: Position → Reaction → Convergence. Trust auto-updates based on who persuades whom."""
-    return await orch.debate(task)
+async def debate_result(job_id: str, wait: float = 0) -> str:
+    """Final transcript of a background debate. wait > 0 long-polls up to that many seconds for it to finish;
+    a still-running job returns its status line instead."""
+    job = jobs.get(job_id)
+    if job is None:
+        return f"No job {job_id} (unknown or expired)."
+    await jobs.wait(job, wait)
+    return job.result if job.status == "done" else _job_line(job)
 
 
 @mcp.tool()
-def trust_scores() -> str:
-    """View current trust scores for all agents."""
-    scores = orch.trust_db.get_all_scores()
-    return "\n".join(f"{a}: {s:.2f}" for a, s in scores.items())
+async def debate_cancel(job_id: str) -> str:
+    """Stop a background debate: its outstanding LLM calls are cancelled and no trust update from it is applied
+    unless the judge's whole update had already started."""
+    job = jobs.get(job_id)
+    if job is None:
+        return f"No job {job_id} (unknown or expired)."
+    await jobs.cancel(job)
+    return _job_line(job)
 
 
 @mcp.tool()
-def update_trust(agent: str, was_correct: bool) -> str:
-    """Update agent trust based on outcome."""
-    orch.trust_db.update_trust(agent, was_correct)
-    s = orch.trust_db.get_trust(agent)
+async def trust_scores(namespace: str = DEFAULT_NAMESPACE, limit: int = 50, offset: int = 0) -> str:
+    """View trust scores in a namespace, highest first, one page of `limit` agents starting at `offset`."""
+    scores = await get_orch().trust.get_all_scores(namespace, limit, offset)
+    return "\n".join(f"{a}: {s:.2f}" for a, s in scores.items()) or f"No trust scores in {namespace}."
+
+
+@mcp.tool()
+async def update_trust(agent: str, was_correct: bool, namespace: str = DEFAULT_NAMESPACE) -> str:
+    """Update agent trust based on outcome. Any agent name registers a new agent in namespace."""
+    s = await get_orch().trust.update_trust(agent, was_correct, namespace)
     return f"{'✅' if was_correct else '❌'} {agent}: {s:.2f}"
 
 
-def main():
-    mcp.run(transport="stdio")
+@mcp.tool()
+async def trust_history(agent: str, hours: float = 168, buckets: int = 24, namespace: str = DEFAULT_NAMESPACE) -> str:
+    """How an agent's trust moved over the last `hours`: downsampled into `buckets` (buckets=0 lists raw events, newest first)."""
+    since, trust = time.time() - hours * 3600, get_orch().trust
+    if buckets <= 0:
+        events = await trust.get_history(agent, since, limit=100, namespace=namespace)
+        return "\n".join(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(e['ts']))} {'✅' if e['was_correct'] else '❌'} {e['score']:.3f}" for e in events) or f"No trust events for {agent}."
+    series = await trust.get_series(agent, since, buckets=buckets, namespace=namespace)
+    return "\n".join(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(b['start']))} avg={b['avg_score']:.3f} min={b['min_score']:.3f} max={b['max_score']:.3f} ({b['correct']}/{b['events']} correct)"
+                      for b in series) or f"No trust events for {agent}."
+
+
+@mcp.tool()
+def queue_status() -> str:
+    """View LLM admission queue depth, in-flight calls, rejections and wait times, hedge rate and timeouts,
+    how many identical concurrent requests were coalesced onto one in-flight call, background debate jobs,
+    and how many agent calls trust-ranked selection skipped."""
+    fmt, o = lambda stats: [f"{k}: {v:.2f}" if isinstance(v, float) else f"{k}: {v}" for k, v in stats.items()], get_orch()
+    return "\n".join(["── admission ──"] + fmt(o.admission.stats()) + ["── hedging ──"] + fmt(o.hedging.stats())
+                     + ["── single-flight ──"] + fmt(o.flights.stats()) + ["── debate jobs ──"] + fmt(jobs.stats())
+                     + ["── agent selection ──"] + fmt(o.selection.stats()))
+
+
+@mcp.tool()
+def metrics(format: str = "text") -> str:
+    """Per-call LLM latency (p50/p95/p99 by agent, tool and model), token usage and errors. format="prometheus" returns Prometheus text exposition."""
+    o = get_orch()
+    if format == "prometheus":
+        gauges = {f"admission_{k}": v for k, v in o.admission.stats().items()}
+        gauges.update({f"hedge_{k}" if not k.startswith("hedge") else k: v for k, v in o.hedging.stats().items()})
+        gauges.update({f"selection_{k}": v for k, v in o.selection.stats().items()})
+        return o.metrics.prometheus(gauges)
+    return o.metrics.format_text()
+
+
+def http_app(transport: Optional[str] = None, stateless: Optional[bool] = None, host: Optional[str] = None):
+    """ASGI app serving every client from this process's one orchestrator, response cache and trust store.
+
+    Also the uvicorn factory for --workers > 1: settings then come from the GLASSBOX_HTTP_* env vars main() sets
+    before uvicorn spawns the workers. Stateless streamable HTTP needs no sticky sessions, so any
+    worker can serve any request; all workers share the one WAL-mode trust DB file.
+    """
+    transport = transport or os.getenv("GLASSBOX_HTTP_TRANSPORT", "streamable-http")
+    mcp.settings.stateless_http = os.getenv("GLASSBOX_HTTP_STATELESS") == "1" if stateless is None else stateless
+    if (host or os.getenv("GLASSBOX_HTTP_HOST", "127.0.0.1")) not in ("127.0.0.1", "localhost", "::1"):
+        mcp.settings.transport_security = None  # DNS-rebinding Host checks only make sense for loopback binds
+    app = mcp.sse_app() if transport == "sse" else mcp.streamable_http_app()
+    mcp_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def app_lifespan(app_):
+        async with mcp_lifespan(app_):
+            _start_warm_up()  # at boot, before the first client connects
+            yield
+        await _shutdown()
+
+    app.router.lifespan_context = app_lifespan
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="glassbox-ai", description="GlassBox AI MCP server.")
+    parser.add_argument("--transport", choices=["stdio", "sse", "streamable-http"], default="stdio",
+                        help="stdio: one client per process (IDE default); sse / streamable-http: many clients over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (streamable-http only; implies --stateless)")
+    parser.add_argument("--stateless", action="store_true", help="no per-client session state: any worker can serve any request")
+    parser.add_argument("--graceful-timeout", type=float, default=30.0, help="seconds to let in-flight requests finish on SIGTERM/SIGINT")
+    args = parser.parse_args(argv)
+    if args.transport == "stdio":
+        mcp.run(transport="stdio")
+        return
+    if args.workers > 1 and args.transport == "sse":
+        parser.error("--workers > 1 needs --transport streamable-http (SSE sessions are pinned to one process)")
+    import uvicorn
+    stateless = args.stateless or args.workers > 1
+    config = dict(host=args.host, port=args.port, timeout_graceful_shutdown=args.graceful_timeout, log_level="warning")
+    if args.workers > 1:
+        os.environ.update(GLASSBOX_HTTP_TRANSPORT=args.transport, GLASSBOX_HTTP_STATELESS="1", GLASSBOX_HTTP_HOST=args.host)
+        uvicorn.run("glassbox.server:http_app", factory=True, workers=args.workers, **config)
+    else:
+        uvicorn.run(http_app(args.transport, stateless, args.host), **config)
+
 
 if __name__ == "__main__":
     main()
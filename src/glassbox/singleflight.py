@@ -0,0 +1,53 @@
+"""Single-flight coalescing: concurrent calls with the same key share one in-flight task and its result."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Key → one shared task, reference-counted by the callers awaiting it.
+
+    A caller that is cancelled (client gone, deadline hit) only detaches: the shared work keeps running for
+    the others and is cancelled, and waited for, once the last caller has gone. The key is forgotten as soon
+    as the task finishes, so results are shared between overlapping calls only — caching them is ResponseCache's job."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[Hashable, list] = {}  # key → [task, waiters]
+        self.leaders = self.joined = self.abandoned = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await fn() — or the identical call already in flight under key. Returns (result, shared), shared=True
+        when this caller attached to another caller's flight. key=None (or enabled=False) always runs fn() alone."""
+        if key is None or not self.enabled:
+            return await fn(), False
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self.joined += 1
+        else:
+            self.leaders += 1
+            flight = self._flights[key] = [asyncio.ensure_future(fn()), 0]
+            flight[0].add_done_callback(lambda _: self._forget(key, flight))
+        flight[1] += 1
+        try:
+            return await asyncio.shield(flight[0]), shared
+        finally:
+            flight[1] -= 1
+            if not flight[1] and not flight[0].done():
+                self.abandoned += 1
+                flight[0].cancel()  # every caller has gone: nobody is left to use the result
+                self._forget(key, flight)
+                await asyncio.wait([flight[0]])  # let it unwind (slots, HTTP streams) before the caller sees its cancel
+
+    def _forget(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict:
+        total = self.leaders + self.joined
+        return {"in_flight": self.in_flight(), "leaders": self.leaders, "joined": self.joined,
+                "coalesce_rate": self.joined / total if total else 0.0, "abandoned": self.abandoned}
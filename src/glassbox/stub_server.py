@@ -0,0 +1,114 @@
+"""Offline OpenAI-compatible HTTP stub for load testing (`python -m glassbox.stub_server --port 8089`).
+
+Serves POST /v1/chat/completions and GET /v1/models with keep-alive HTTP/1.1 on plain asyncio streams, using
+a StubProfile for latency, injected errors and templated replies. Point the orchestrator at it with
+OPENAI_BASE_URL=http://127.0.0.1:8089/v1 (any OPENAI_API_KEY value works).
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Optional, Tuple
+
+from .backends import StubProfile
+from .transcript import estimate_tokens
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+class StubServer:
+    def __init__(self, profile: Optional[StubProfile] = None, host: str = "127.0.0.1", port: int = 8089):
+        self.profile = profile or StubProfile()
+        self.host, self.port = host, port
+        self.requests = self.errors = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # resolves port=0
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def _respond(self, method: str, path: str, body: bytes) -> Tuple[int, dict]:
+        if method == "GET" and path.rstrip("/").endswith("/models"):
+            return 200, {"object": "list", "data": [{"id": m, "object": "model", "owned_by": "stub"} for m in ("gpt-4o", "gpt-4o-mini")]}
+        if method != "POST" or not path.rstrip("/").endswith("/chat/completions"):
+            return 404, {"error": {"message": f"no route for {method} {path}", "type": "invalid_request_error"}}
+        try:
+            req = json.loads(body or b"{}")
+            model, messages = req["model"], req["messages"]
+        except (ValueError, KeyError) as e:
+            return 400, {"error": {"message": f"bad request: {e}", "type": "invalid_request_error"}}
+        self.requests += 1
+        await asyncio.sleep(self.profile.sample_latency())
+        if self.profile.should_fail():
+            self.errors += 1
+            status = self.profile.rng.choice((429, 500))
+            return status, {"error": {"message": "stub injected error", "type": "rate_limit_error" if status == 429 else "server_error"}}
+        text = self.profile.reply(model, messages)
+        prompt = estimate_tokens("".join(m.get("content") or "" for m in messages))
+        return 200, {"id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "object": "chat.completion", "created": int(time.time()), "model": model,
+                     "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                     "usage": {"prompt_tokens": prompt, "completion_tokens": estimate_tokens(text), "total_tokens": prompt + estimate_tokens(text)}}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, payload = await self._respond(method, path, body)
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\ncontent-type: application/json\r\ncontent-length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="glassbox-stub", description="Offline OpenAI-compatible stub server for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="lognormal:0.8,0.4", help="fixed:S | uniform:LO,HI | lognormal:MEDIAN,SIGMA | exp:MEAN")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 429/500")
+    parser.add_argument("--responses", default=None, help="JSON file mapping prompt substrings to reply templates ({agent}, {model}, {task})")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    responses = None
+    if args.responses:
+        with open(args.responses, encoding="utf-8") as f:
+            responses = json.load(f)
+
+    async def serve():
+        server = await StubServer(StubProfile(args.latency, args.error_rate, responses, args.seed), args.host, args.port).start()
+        print(f"stub listening on {server.base_url}", flush=True)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
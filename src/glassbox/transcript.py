@@ -0,0 +1,79 @@
+"""Rolling debate transcript — latest round verbatim, older rounds as cached per-round digests."""
+
+import re
+from typing import Dict, List, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap ~4 chars/token estimate (no tokenizer dependency)."""
+    return (len(text) + 3) // 4
+
+
+def _clip(text: str, tokens: int) -> str:
+    """First sentences of text that fit in ~tokens, cut on a word boundary if one sentence is too long."""
+    limit = max(tokens, 1) * 4
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    kept = ""
+    for sentence in re.split(r"(?<=[.!?])\s+", text):
+        if len(kept) + len(sentence) + 1 > limit:
+            break
+        kept = f"{kept} {sentence}".strip()
+    return kept or text[:limit].rsplit(" ", 1)[0] + "…"
+
+
+class TranscriptManager:
+    """Debate log grouped by round. render() keeps the latest finished round (and the one in progress)
+    verbatim and swaps every older round for a digest that is built once and capped at digest_tokens.
+    digest_tokens=None keeps the whole transcript verbatim."""
+
+    def __init__(self, emojis: Dict[str, str], digest_tokens: Optional[int] = 150):
+        self.emojis = emojis
+        self.digest_tokens = digest_tokens
+        self.rounds: List[List[Dict]] = []
+        self._digests: Dict[int, str] = {}
+
+    def state(self) -> Dict:
+        """JSON-able snapshot: every round plus the digests built so far (reused as-is after from_state)."""
+        return {"rounds": self.rounds, "digests": {str(r): d for r, d in self._digests.items()}, "digest_tokens": self.digest_tokens}
+
+    @classmethod
+    def from_state(cls, emojis: Dict[str, str], state: Dict) -> "TranscriptManager":
+        ts = cls(emojis, state["digest_tokens"])
+        ts.rounds = [list(rd) for rd in state["rounds"]]
+        ts._digests = {int(r): d for r, d in state["digests"].items()}
+        return ts
+
+    def start_round(self):
+        self.rounds.append([])
+
+    def add(self, agent: str, text: str, prompt_tokens: int = 0, model: Optional[str] = None):
+        self.rounds[-1].append({"a": agent, "r": len(self.rounds) - 1, "t": text, "p": prompt_tokens, "m": model})
+
+    @property
+    def log(self) -> List[Dict]:
+        return [e for rd in self.rounds for e in rd]
+
+    def _line(self, e: Dict, text: str) -> str:
+        return f"{self.emojis.get(e['a'], '⚪')} @{e['a']}: {text}"
+
+    def digest(self, r: int) -> str:
+        if r not in self._digests:
+            entries = self.rounds[r]
+            per_entry = max(self.digest_tokens // max(len(entries), 1), 1)
+            self._digests[r] = "\n".join([f"[Round {r + 1} digest]"] + [self._line(e, _clip(e["t"], per_entry)) for e in entries])
+        return self._digests[r]
+
+    def render(self) -> str:
+        """Prompt history for the next turn."""
+        if not any(self.rounds):
+            return "(no prior messages)"
+        verbatim_from = 0 if self.digest_tokens is None else max(len(self.rounds) - 2, 0)
+        parts = [self.digest(r) for r in range(verbatim_from) if self.rounds[r]]
+        parts += [self._line(e, e["t"]) for rd in self.rounds[verbatim_from:] for e in rd]
+        return "\n".join(parts)
+
+    def full(self) -> str:
+        """Whole transcript verbatim (for the summary and the judge)."""
+        return "\n".join(f"@{e['a']}: {e['t']}" for e in self.log)
@@ -1,68 +1,427 @@
 """SQLite-based trust score persistence with exponential moving average updates."""
 
+import asyncio
+import heapq
+import json
 import sqlite3
-from typing import Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_NAMESPACE = "default"
+DEFAULT_AGENTS = ("architect", "pragmatist", "critic")  # seeded at 0.85 the first time each namespace is touched
+SCHEMA_VERSION = 2  # 1: agent-keyed tables; 2: (namespace, agent) keys + namespaced events
+
+# Fixed SQL text so sqlite3's per-connection statement cache reuses the prepared statements.
+_GET_SCORE = "SELECT score FROM trust_scores WHERE namespace = ? AND agent = ?"
+_GET_MANY = "SELECT agent, score FROM trust_scores WHERE namespace = ? AND agent IN (SELECT value FROM json_each(?))"  # JSON array of names
+# Walks idx_trust_scores_rank in order and stops after LIMIT rows: top-k never scans the namespace.
+_GET_TOP = "SELECT agent, score FROM trust_scores WHERE namespace = ? ORDER BY score DESC, agent LIMIT ? OFFSET ?"
+_GET_STATS = "SELECT score, correct_count, total_count FROM trust_scores WHERE namespace = ? AND agent = ?"
+_SEED = "INSERT OR IGNORE INTO trust_scores (namespace, agent, score) VALUES (?, ?, 0.85)"
+# EMA (alpha 0.1) + clamp [0.3, 1.0] + counters in one statement: no read-modify-write race between connections.
+# ?1 namespace, ?2 agent, ?3 outcome as 1.0/0.0, ?4 outcome as 1/0.
+_UPSERT_EMA = """INSERT INTO trust_scores (namespace, agent, score, correct_count, total_count, last_updated)
+    VALUES (?1, ?2, MAX(0.3, MIN(1.0, 0.85 + 0.1 * (?3 - 0.85))), ?4, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT(namespace, agent) DO UPDATE SET score = MAX(0.3, MIN(1.0, score + 0.1 * (?3 - score))),
+    correct_count = correct_count + ?4, total_count = total_count + 1, last_updated = CURRENT_TIMESTAMP"""
+_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_LOAD_NAMESPACE = "SELECT agent, score, correct_count, total_count FROM trust_scores WHERE namespace = ?"  # primary-key prefix
+_CREDIT = "INSERT OR IGNORE INTO trust_credits (namespace, key, ts) VALUES (?, ?, ?)"  # rowcount 0: credited before
+_LOG_EVENT = "INSERT INTO trust_events (namespace, agent, ts, was_correct, score) VALUES (?, ?, ?, ?, ?)"
+_HISTORY = """SELECT ts, was_correct, score FROM trust_events WHERE namespace = ? AND agent = ? AND ts >= ? AND ts < ?
+    ORDER BY ts DESC LIMIT ?"""
+_SERIES = """SELECT CAST((ts - ?3) / ?4 AS INTEGER) AS bucket, COUNT(*), SUM(was_correct), AVG(score), MIN(score), MAX(score)
+    FROM trust_events WHERE namespace = ?1 AND agent = ?2 AND ts >= ?3 AND ts < ?5 GROUP BY bucket ORDER BY bucket"""
+_CREATE_SCORES = """CREATE TABLE IF NOT EXISTS trust_scores (
+    namespace TEXT NOT NULL DEFAULT 'default',
+    agent TEXT NOT NULL,
+    score REAL DEFAULT 0.85,
+    correct_count INTEGER DEFAULT 0,
+    total_count INTEGER DEFAULT 0,
+    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (namespace, agent)
+) WITHOUT ROWID"""
+EVENT_RETENTION = 90 * 24 * 3600  # seconds of trust_events kept by compact_events()
+MAX_EVENTS_PER_AGENT = 100_000    # newest events kept per (namespace, agent) by compact_events()
 
 
 class TrustDB:
-    def __init__(self, db_path: str = "trust_scores.db"):
+    """One long-lived connection in WAL mode, shared by the asyncio server and worker threads behind a lock.
+
+    Scores are keyed by (namespace, agent): one namespace per repository or team, each with any number of
+    agents, registered simply by updating them. A namespace gets its DEFAULT_AGENTS rows the first time this
+    process touches it; unknown agents read as 0.85. Files from before namespaces are migrated in place into
+    DEFAULT_NAMESPACE on open.
+
+    write_back=True serves reads from memory and applies update_trust in memory first. A namespace's rows are
+    loaded the first time it is used. Buffered outcomes are flushed in one batch every flush_interval seconds,
+    once flush_threshold updates are pending, and on close(); the flush replays them through the same UPSERT as
+    direct mode, so updates from every process sharing the file land. Writes by other processes are noticed
+    within sync_interval via PRAGMA data_version and reload each cached namespace on its next use; a row with
+    unflushed local updates keeps its local value until the flush.
+
+    Every update also appends a row to trust_events (in the same transaction as the score change; batched with
+    the flush in write-back mode). compact_events() runs every compact_every events to keep the log bounded.
+    """
+
+    def __init__(self, db_path: str = "trust_scores.db", write_back: bool = False, flush_interval: float = 1.0,
+                 flush_threshold: int = 64, sync_interval: float = 0.5, compact_every: int = 10_000):
         self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0, cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # WAL + NORMAL: durable across app crashes, fsync only at checkpoints
+        self.write_back = write_back
+        self.flush_threshold = flush_threshold
+        self.sync_interval = sync_interval
+        self._cache: Dict[str, Dict[str, list]] = {}  # namespace → agent → [score, correct_count, total_count]
+        self._stale: set = set()  # cached namespaces to reload on next use
+        self._dirty: set = set()  # (namespace, agent)
+        self._pending = 0
+        self._events: List[tuple] = []  # write-back: (namespace, agent, ts, was_correct, score) awaiting flush
+        self._seeded: set = set()
+        self.compact_every = compact_every
+        self._since_compact = 0
+        self._data_version = None
+        self._synced_at = 0.0
+        self._stop = threading.Event()
+        self._flusher = None
         self._init_db()
+        if write_back:
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            self._flusher = threading.Thread(target=self._flush_loop, args=(flush_interval,), name="trustdb-flush", daemon=True)
+            self._flusher.start()
+
+    @contextmanager
+    def _tx(self):
+        """Serialized transaction: commits on success, rolls back on error."""
+        with self._lock, self._conn:
+            yield self._conn
 
     def _init_db(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS trust_scores (
-                agent TEXT PRIMARY KEY,
-                score REAL DEFAULT 0.85,
-                correct_count INTEGER DEFAULT 0,
-                total_count INTEGER DEFAULT 0,
-                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        for agent in ["architect", "pragmatist", "critic"]:
-            conn.execute("INSERT OR IGNORE INTO trust_scores (agent, score) VALUES (?, 0.85)", (agent,))
-        conn.commit()
-        conn.close()
-
-    def get_trust(self, agent: str) -> float:
-        conn = sqlite3.connect(self.db_path)
-        result = conn.execute("SELECT score FROM trust_scores WHERE agent = ?", (agent,)).fetchone()
-        conn.close()
+        with self._tx() as conn:
+            conn.execute("BEGIN IMMEDIATE")  # covers the DDL too: a concurrent opener waits, then sees the migrated schema
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._migrate(conn)
+            conn.execute(_CREATE_SCORES)
+            # Top-k index: get_all_scores pages through it in order without sorting the namespace.
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_trust_scores_rank ON trust_scores (namespace, score DESC, agent)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS trust_events (
+                    id INTEGER PRIMARY KEY,
+                    agent TEXT NOT NULL,
+                    ts REAL NOT NULL,
+                    was_correct INTEGER NOT NULL,
+                    score REAL NOT NULL,
+                    namespace TEXT NOT NULL DEFAULT 'default'
+                )
+            """)
+            # Covering index: history/series queries never touch the table rows.
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_trust_events_ns_agent_ts ON trust_events (namespace, agent, ts, was_correct, score)")
+            # Keys of outcome batches already applied, so a replayed batch (e.g. a re-judged transcript) credits once.
+            conn.execute("""CREATE TABLE IF NOT EXISTS trust_credits (namespace TEXT NOT NULL, key TEXT NOT NULL, ts REAL NOT NULL,
+                PRIMARY KEY (namespace, key)) WITHOUT ROWID""")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._seed(DEFAULT_NAMESPACE)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Move a schema-1 file (agent-keyed, one global namespace) into DEFAULT_NAMESPACE."""
+        columns = lambda table: {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if columns("trust_scores") and "namespace" not in columns("trust_scores"):
+            conn.execute("ALTER TABLE trust_scores RENAME TO trust_scores_v1")
+            conn.execute(_CREATE_SCORES)
+            conn.execute("""INSERT INTO trust_scores (namespace, agent, score, correct_count, total_count, last_updated)
+                SELECT 'default', agent, score, correct_count, total_count, last_updated FROM trust_scores_v1 WHERE agent IS NOT NULL""")
+            conn.execute("DROP TABLE trust_scores_v1")
+        if columns("trust_events") and "namespace" not in columns("trust_events"):
+            conn.execute("ALTER TABLE trust_events ADD COLUMN namespace TEXT NOT NULL DEFAULT 'default'")
+        conn.execute("DROP INDEX IF EXISTS idx_trust_events_agent_ts")
+
+    def _seed(self, namespace: str):
+        """Insert namespace's DEFAULT_AGENTS rows once per process, so unused namespaces cost nothing."""
+        if namespace in self._seeded:
+            return
+        with self._tx() as conn:
+            conn.executemany(_SEED, [(namespace, agent) for agent in DEFAULT_AGENTS])
+            self._stale.add(namespace)  # our own commit doesn't move data_version
+            self._seeded.add(namespace)
+
+    # ── write-back cache ──
+
+    def _rows(self, namespace: str) -> Dict[str, list]:
+        """namespace's cached rows, (re)loaded from disk when missing or stale; rows with unflushed local updates are kept."""
+        with self._lock:
+            self._sync()
+            rows = self._cache.get(namespace)
+            if rows is None or namespace in self._stale:
+                fresh = {agent: [score, correct, total] for agent, score, correct, total in self._conn.execute(_LOAD_NAMESPACE, (namespace,))}
+                fresh.update({agent: row for agent, row in (rows or {}).items() if (namespace, agent) in self._dirty})
+                self._cache[namespace] = rows = fresh
+                self._stale.discard(namespace)
+            return rows
+
+    def _sync(self):
+        """Mark every cached namespace stale if another connection committed since the last check (at most every sync_interval)."""
+        if time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._data_version:
+                self._data_version = version
+                self._stale.update(self._cache)
+            self._synced_at = time.monotonic()
+
+    def flush(self):
+        """Apply every buffered outcome and its event in one transaction, then reload the namespaces it touched."""
+        with self._lock:
+            if not self._events:
+                return
+            with self._tx() as conn:
+                events = [(namespace, agent, ts, ok, self._upsert(conn, namespace, agent, ok)) for namespace, agent, ts, ok, _ in self._events]
+                conn.executemany(_LOG_EVENT, events)
+            self._logged(len(events))
+            self._stale.update(namespace for namespace, _ in self._dirty)
+            self._dirty.clear()
+            self._events.clear()
+            self._pending = 0
+
+    def _flush_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            self.flush()
+
+    # ── queries ──
+
+    def get_trust(self, agent: str, namespace: str = DEFAULT_NAMESPACE) -> float:
+        if self.write_back:
+            row = self._rows(namespace).get(agent)
+            return row[0] if row else 0.85
+        with self._lock:
+            result = self._conn.execute(_GET_SCORE, (namespace, agent)).fetchone()
         return result[0] if result else 0.85
 
-    def get_all_scores(self) -> Dict[str, float]:
-        conn = sqlite3.connect(self.db_path)
-        results = conn.execute("SELECT agent, score FROM trust_scores ORDER BY score DESC").fetchall()
-        conn.close()
+    def get_trust_many(self, agents: Iterable[str], namespace: str = DEFAULT_NAMESPACE) -> Dict[str, float]:
+        """Scores for several agents in one query (0.85 for unknown agents)."""
+        agents = list(agents)
+        if self.write_back:
+            with self._lock:
+                rows = self._rows(namespace)
+                return {a: rows[a][0] if a in rows else 0.85 for a in agents}
+        with self._lock:
+            found = dict(self._conn.execute(_GET_MANY, (namespace, json.dumps(agents))).fetchall())
+        return {a: found.get(a, 0.85) for a in agents}
+
+    def get_all_scores(self, namespace: str = DEFAULT_NAMESPACE, limit: Optional[int] = None, offset: int = 0) -> Dict[str, float]:
+        """namespace's agents by descending score: the page of `limit` rows starting at `offset` (limit=None: all)."""
+        self._seed(namespace)
+        if self.write_back:
+            with self._lock:
+                rows = [(a, row[0]) for a, row in self._rows(namespace).items()]
+            rank = lambda x: (-x[1], x[0])
+            ranked = sorted(rows, key=rank) if limit is None else heapq.nsmallest(offset + limit, rows, key=rank)
+            return dict(ranked[offset:])
+        with self._lock:
+            results = self._conn.execute(_GET_TOP, (namespace, -1 if limit is None else limit, offset)).fetchall()
         return {agent: score for agent, score in results}
 
-    def get_stats(self, agent: str) -> Optional[Dict]:
-        conn = sqlite3.connect(self.db_path)
-        result = conn.execute("SELECT score, correct_count, total_count FROM trust_scores WHERE agent = ?", (agent,)).fetchone()
-        conn.close()
+    def get_stats(self, agent: str, namespace: str = DEFAULT_NAMESPACE) -> Optional[Dict]:
+        if self.write_back:
+            result = self._rows(namespace).get(agent)
+        else:
+            with self._lock:
+                result = self._conn.execute(_GET_STATS, (namespace, agent)).fetchone()
         if not result:
             return None
         score, correct, total = result
         return {"agent": agent, "trust_score": score, "correct_count": correct, "total_count": total, "accuracy": (correct / total * 100) if total > 0 else 0}
 
-    def update_trust(self, agent: str, was_correct: bool):
-        conn = sqlite3.connect(self.db_path)
-        result = conn.execute("SELECT score, correct_count, total_count FROM trust_scores WHERE agent = ?", (agent,)).fetchone()
-        if not result:
-            conn.execute("INSERT INTO trust_scores (agent, score) VALUES (?, 0.85)", (agent,))
-            old_score, correct, total = 0.85, 0, 0
-        else:
-            old_score, correct, total = result
-        correct += 1 if was_correct else 0
-        total += 1
-        new_score = max(0.3, min(1.0, old_score + 0.1 * ((1.0 if was_correct else 0.0) - old_score)))
-        conn.execute("UPDATE trust_scores SET score=?, correct_count=?, total_count=?, last_updated=CURRENT_TIMESTAMP WHERE agent=?", (new_score, correct, total, agent))
-        conn.commit()
-        conn.close()
-
-    def reset_all(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("UPDATE trust_scores SET score=0.85, correct_count=0, total_count=0")
-        conn.commit()
-        conn.close()
+    def update_trust(self, agent: str, was_correct: bool, namespace: str = DEFAULT_NAMESPACE) -> float:
+        """Apply one outcome to agent's EMA trust and return the new score."""
+        return self.update_trust_many([(agent, was_correct)], namespace)[0]
+
+    def update_trust_many(self, outcomes: Iterable[Tuple[str, bool]], namespace: str = DEFAULT_NAMESPACE) -> List[float]:
+        """Apply (agent, was_correct) outcomes in order as one transaction; returns each update's new score."""
+        outcomes = list(outcomes)
+        self._seed(namespace)
+        now, scores = time.time(), []
+        if self.write_back:
+            with self._lock:
+                rows = self._rows(namespace)
+                for agent, ok in outcomes:
+                    score, correct, total = rows.get(agent, [0.85, 0, 0])
+                    rows[agent] = [max(0.3, min(1.0, score + 0.1 * ((1.0 if ok else 0.0) - score))), correct + (1 if ok else 0), total + 1]
+                    self._events.append((namespace, agent, now, 1 if ok else 0, rows[agent][0]))
+                    self._dirty.add((namespace, agent))
+                    scores.append(rows[agent][0])
+                self._pending += len(outcomes)
+                if self._pending >= self.flush_threshold:
+                    self.flush()
+                return scores
+        with self._tx() as conn:
+            scores = self._apply(conn, outcomes, namespace, now)
+        self._logged(len(outcomes))
+        return scores
+
+    def credit_once(self, key: str, outcomes: Iterable[Tuple[str, bool]], namespace: str = DEFAULT_NAMESPACE) -> Optional[List[float]]:
+        """update_trust_many at most once per (namespace, key): the key is recorded with the outcomes, and a key
+        recorded before returns None without touching trust. In write-back mode the key is committed at once and
+        the outcomes are buffered as usual."""
+        outcomes = list(outcomes)
+        self._seed(namespace)
+        with self._lock:
+            if self.write_back:
+                with self._tx() as conn:
+                    if not conn.execute(_CREDIT, (namespace, key, time.time())).rowcount:
+                        return None
+                return self.update_trust_many(outcomes, namespace)
+            with self._tx() as conn:
+                if not conn.execute(_CREDIT, (namespace, key, time.time())).rowcount:
+                    return None
+                scores = self._apply(conn, outcomes, namespace, time.time())
+        self._logged(len(outcomes))
+        return scores
+
+    def _apply(self, conn: sqlite3.Connection, outcomes: List[Tuple[str, bool]], namespace: str, now: float) -> List[float]:
+        """Upsert each outcome and log its event on conn (inside the caller's transaction); returns the new scores."""
+        scores = [self._upsert(conn, namespace, agent, ok) for agent, ok in outcomes]
+        conn.executemany(_LOG_EVENT, [(namespace, agent, now, 1 if ok else 0, score) for (agent, ok), score in zip(outcomes, scores)])
+        return scores
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, namespace: str, agent: str, ok) -> float:
+        """Apply one outcome with _UPSERT_EMA; returns the new score."""
+        params = (namespace, agent, 1.0 if ok else 0.0, 1 if ok else 0)
+        if _RETURNING:
+            return conn.execute(_UPSERT_EMA + " RETURNING score", params).fetchall()[0][0]
+        conn.execute(_UPSERT_EMA, params)
+        return conn.execute(_GET_SCORE, (namespace, agent)).fetchone()[0]
+
+    # ── event log ──
+
+    def _logged(self, n: int):
+        self._since_compact += n
+        if self.compact_every and self._since_compact >= self.compact_every:
+            self.compact_events()
+
+    def get_history(self, agent: str, since: Optional[float] = None, until: Optional[float] = None, limit: int = 1000,
+                    namespace: str = DEFAULT_NAMESPACE) -> List[Dict]:
+        """Raw trust events for agent in [since, until) (unix seconds), newest first."""
+        if self.write_back:
+            self.flush()
+        with self._lock:
+            rows = self._conn.execute(_HISTORY, (namespace, agent, since or 0.0, until or float("inf"), limit)).fetchall()
+        return [{"ts": ts, "was_correct": bool(ok), "score": score} for ts, ok, score in rows]
+
+    def get_series(self, agent: str, since: float, until: Optional[float] = None, buckets: int = 24,
+                   namespace: str = DEFAULT_NAMESPACE) -> List[Dict]:
+        """agent's trust in [since, until) downsampled to at most `buckets` equal-width buckets (empty ones omitted)."""
+        if self.write_back:
+            self.flush()
+        until = until or time.time()
+        width = max((until - since) / max(buckets, 1), 1e-9)
+        with self._lock:
+            rows = self._conn.execute(_SERIES, (namespace, agent, since, width, until)).fetchall()
+        return [{"start": since + b * width, "events": n, "correct": ok, "avg_score": avg, "min_score": lo, "max_score": hi}
+                for b, n, ok, avg, lo, hi in rows]
+
+    def compact_events(self, max_age: float = EVENT_RETENTION, max_per_agent: int = MAX_EVENTS_PER_AGENT) -> int:
+        """Delete events older than max_age seconds and all but the newest max_per_agent per agent. Returns rows deleted.
+        Credit keys older than max_age go too."""
+        with self._tx() as conn:
+            conn.execute("DELETE FROM trust_credits WHERE ts < ?", (time.time() - max_age,))
+            deleted = conn.execute("DELETE FROM trust_events WHERE ts < ?", (time.time() - max_age,)).rowcount
+            over = conn.execute("SELECT namespace, agent FROM trust_events GROUP BY namespace, agent HAVING COUNT(*) > ?", (max_per_agent,)).fetchall()
+            for namespace, agent in over:
+                cutoff = conn.execute("SELECT ts FROM trust_events WHERE namespace = ? AND agent = ? ORDER BY ts DESC LIMIT 1 OFFSET ?",
+                                      (namespace, agent, max_per_agent - 1)).fetchone()[0]
+                deleted += conn.execute("DELETE FROM trust_events WHERE namespace = ? AND agent = ? AND ts < ?", (namespace, agent, cutoff)).rowcount
+        self._since_compact = 0
+        return deleted
+
+    def reset_all(self, namespace: Optional[str] = None):
+        """Reset scores to 0.85 in one namespace, or in every namespace when namespace is None."""
+        with self._lock:
+            if self.write_back:
+                self.flush()  # keep the event log complete; the reset itself isn't an outcome
+            with self._tx() as conn:
+                if namespace is None:
+                    conn.execute("UPDATE trust_scores SET score=0.85, correct_count=0, total_count=0")
+                else:
+                    conn.execute("UPDATE trust_scores SET score=0.85, correct_count=0, total_count=0 WHERE namespace = ?", (namespace,))
+            self._stale.update(self._cache if namespace is None else [namespace])
+
+    def close(self):
+        """Stop the flusher, write any pending updates, and close the connection."""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            if self.write_back:
+                self.flush()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncTrustDB:
+    """Awaitable facade over a TrustDB for code running on the event loop.
+
+    Every call runs on one dedicated executor thread, so a slow commit or fsync never blocks the loop and
+    operations apply in submission order (an update is visible to every read awaited after it).
+    """
+
+    def __init__(self, db: Optional[TrustDB] = None):
+        self.db = db if db is not None else TrustDB()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trustdb")
+
+    async def run(self, fn: Callable, *args):
+        """Run fn(*args) on the DB thread, e.g. to read several values as one ordered step."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def get_trust(self, agent: str, namespace: str = DEFAULT_NAMESPACE) -> float:
+        return await self.run(self.db.get_trust, agent, namespace)
+
+    async def get_trust_many(self, agents: Iterable[str], namespace: str = DEFAULT_NAMESPACE) -> Dict[str, float]:
+        return await self.run(self.db.get_trust_many, list(agents), namespace)
+
+    async def get_all_scores(self, namespace: str = DEFAULT_NAMESPACE, limit: Optional[int] = None, offset: int = 0) -> Dict[str, float]:
+        return await self.run(self.db.get_all_scores, namespace, limit, offset)
+
+    async def get_stats(self, agent: str, namespace: str = DEFAULT_NAMESPACE) -> Optional[Dict]:
+        return await self.run(self.db.get_stats, agent, namespace)
+
+    async def update_trust(self, agent: str, was_correct: bool, namespace: str = DEFAULT_NAMESPACE) -> float:
+        return await self.run(self.db.update_trust, agent, was_correct, namespace)
+
+    async def update_trust_many(self, outcomes: Iterable[Tuple[str, bool]], namespace: str = DEFAULT_NAMESPACE) -> List[float]:
+        return await self.run(self.db.update_trust_many, list(outcomes), namespace)
+
+    async def credit_once(self, key: str, outcomes: Iterable[Tuple[str, bool]], namespace: str = DEFAULT_NAMESPACE) -> Optional[List[float]]:
+        return await self.run(self.db.credit_once, key, list(outcomes), namespace)
+
+    async def get_history(self, agent: str, since: Optional[float] = None, until: Optional[float] = None, limit: int = 1000,
+                          namespace: str = DEFAULT_NAMESPACE) -> List[Dict]:
+        return await self.run(self.db.get_history, agent, since, until, limit, namespace)
+
+    async def get_series(self, agent: str, since: float, until: Optional[float] = None, buckets: int = 24,
+                         namespace: str = DEFAULT_NAMESPACE) -> List[Dict]:
+        return await self.run(self.db.get_series, agent, since, until, buckets, namespace)
+
+    async def reset_all(self, namespace: Optional[str] = None):
+        return await self.run(self.db.reset_all, namespace)
+
+    async def flush(self):
+        return await self.run(self.db.flush)
+
+    def close(self):
+        """Finish queued operations, then close the underlying TrustDB."""
+        self._executor.shutdown(wait=True)
+        self.db.close()
@@ -1,4 +1,4 @@
-"""20 edge case tests for GlassBox AI — TrustDB, Orchestrator, Server."""
+"""Tests for GlassBox AI — TrustDB, Orchestrator, Server and the modules behind them."""
 
 import asyncio
 import os
@@ -20,6 +20,7 @@ def db():
         path = f.name
     t = TrustDB(db_path=path)
     yield t
+    t.close()
     os.unlink(path)
 
 
@@ -219,3 +220,1075 @@ def test_critic_model_name():
     from glassbox.orchestrator import AGENTS
     assert AGENTS['critic'][0] == 'gpt-4o-mini', "Critic model name should be 'gpt-4o-mini'"
 
+
+
+# ── Orchestrator: Debate Scheduling (offline fake client) ────────────
+
+class _FakeCompletions:
+    """Stands in for client.chat.completions; records calls and peak concurrency."""
+
+    def __init__(self, delay=0.01, reply=lambda model, system, user: f"reply from {model}"):
+        self.delay, self.reply = delay, reply
+        self.calls, self.active, self.peak = [], 0, 0
+
+    async def create(self, model, temperature, max_tokens, messages, **kwargs):
+        self.calls.append({"model": model, "system": messages[0]["content"], "user": messages[1]["content"]})
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay(model) if callable(self.delay) else self.delay)
+        finally:
+            self.active -= 1
+        text = self.reply(model, messages[0]["content"], messages[1]["content"])
+        return type("R", (), {"choices": [type("C", (), {"message": type("M", (), {"content": text})()})()]})()
+
+
+class _FakeClient:
+    def __init__(self, **kwargs):
+        self.completions = _FakeCompletions(**kwargs)
+        self.chat = type("Chat", (), {"completions": self.completions})()
+
+
+@pytest.fixture
+def orch(db):
+    from glassbox.orchestrator import MultiAgentOrchestrator
+    o = MultiAgentOrchestrator(cache_path=None, debate_path=None, trust_db=db)
+    o.backend._client = _FakeClient()
+    return o
+
+
+def test_23_parallel_debate_runs_rounds_as_waves(orch):
+    """Parallel debate: each round is one concurrent wave, summary + judge run together."""
+    result = asyncio.run(orch.debate("Redis or Postgres?", parallel=True))
+    calls = orch.backend._client.completions
+    assert len(calls.calls) == 3 * 3 + 2
+    assert calls.peak == 3
+    assert "━━ CONVERGENCE ━━" in result
+
+
+def test_24_parallel_debate_agents_see_only_earlier_rounds(orch):
+    """In parallel mode no agent sees a same-round reply; in serial mode later agents do."""
+    asyncio.run(orch.debate("Redis or Postgres?", parallel=True))
+    round1 = orch.backend._client.completions.calls[:3]
+    assert all("(no prior messages)" in c["user"] for c in round1)
+    orch.backend._client = _FakeClient()
+    asyncio.run(orch.debate("Redis or Postgres?"))
+    round1 = orch.backend._client.completions.calls[:3]
+    assert "(no prior messages)" in round1[0]["user"]
+    assert "@architect:" in round1[1]["user"]
+
+
+# ── Transcript Compaction ─────────────────────────────────────────────
+
+def test_25_transcript_digests_older_rounds_once():
+    """Older rounds become a capped digest built once; latest round stays verbatim."""
+    from glassbox.transcript import TranscriptManager, estimate_tokens
+    ts = TranscriptManager({"architect": "🔵", "critic": "🟡"}, digest_tokens=20)
+    long = "First point is short. " + "filler words " * 100
+    for _ in range(3):
+        ts.start_round()
+        ts.add("architect", long)
+        ts.add("critic", long)
+    ts.start_round()
+    history = ts.render()
+    assert history.count("[Round 1 digest]") == 1 and history.count("[Round 2 digest]") == 1
+    assert history.count(long) == 2
+    assert estimate_tokens(ts.digest(0)) <= 20 + 10
+    assert ts.digest(0) is ts._digests[0]
+
+
+def test_26_transcript_none_cap_keeps_everything():
+    """digest_tokens=None reproduces the full verbatim history."""
+    from glassbox.transcript import TranscriptManager
+    ts = TranscriptManager({"architect": "🔵"}, digest_tokens=None)
+    assert ts.render() == "(no prior messages)"
+    for i in range(3):
+        ts.start_round()
+        ts.add("architect", f"round {i}")
+    assert ts.render() == "\n".join(f"🔵 @architect: round {i}" for i in range(3))
+
+
+def test_27_debate_reports_prompt_tokens_per_turn(orch):
+    """Each debate turn shows its prompt size; compaction keeps round 3 prompts smaller."""
+    orch.backend._client = _FakeClient(reply=lambda m, s, u: "A long considered opinion. " * 60)
+    compact = asyncio.run(orch.debate("Redis or Postgres?", parallel=True, digest_tokens=30))
+    orch.backend._client = _FakeClient(reply=lambda m, s, u: "A long considered opinion. " * 60)
+    full = asyncio.run(orch.debate("Redis or Postgres?", parallel=True, digest_tokens=None))
+    assert compact.count("prompt≈") == 9
+    tokens = lambda out: [int(x.split(" tok")[0]) for x in out.split("prompt≈")[1:]]
+    assert sum(tokens(compact)[6:]) < sum(tokens(full)[6:])
+
+
+# ── Response Cache ────────────────────────────────────────────────────
+
+@pytest.fixture
+def cache():
+    from glassbox.response_cache import ResponseCache
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        path = f.name
+    yield ResponseCache(path, ttl=60, max_entries=3)
+    os.unlink(path)
+
+
+def test_28_cache_ttl_and_lru_eviction(cache):
+    """Expired entries miss; beyond max_entries the least recently used entry goes first."""
+    for k in "abc":
+        cache.put(k, k.upper())
+    assert cache.get("a") == "A"  # refresh a, so b is now least recently used
+    cache.put("d", "D")
+    assert len(cache) == 3
+    assert cache.get("b") is None and cache.get("a") == "A"
+    cache.ttl = 0
+    assert cache.get("a") is None
+
+
+def test_29_execute_reports_hits_and_misses(orch, cache):
+    """Second identical execute is served from cache; use_cache=False bypasses it."""
+    orch.cache = cache
+    first = asyncio.run(orch.execute("Redis or Postgres?", ["architect", "critic"]))
+    second = asyncio.run(orch.execute("Redis or Postgres?", ["architect", "critic"]))
+    assert first["cache"] == {"hits": 0, "misses": 2}
+    assert second["cache"] == {"hits": 2, "misses": 0}
+    assert len(orch.backend._client.completions.calls) == 2
+    bypass = asyncio.run(orch.execute_formatted("Redis or Postgres?", ["architect"], use_cache=False))
+    assert len(orch.backend._client.completions.calls) == 3
+    assert "Cache: 0 hit(s), 0 miss(es)" in bypass
+
+
+def test_30_errors_are_not_cached(orch, cache):
+    """A failed completion is not stored, so the next call retries the API."""
+    orch.cache = cache
+    async def boom(**kwargs): raise RuntimeError("429")
+    real = orch.backend._client.completions.create
+    orch.backend._client.completions.create = boom
+    assert asyncio.run(orch._ask("architect", "sys", "hi")).startswith("[ERROR")
+    orch.backend._client.completions.create = real
+    assert asyncio.run(orch._ask("architect", "sys", "hi")) == "reply from gpt-4o"
+    assert len(cache) == 1
+
+
+def test_83_replayed_debate_credits_once_per_namespace(orch, db, tmp_path, monkeypatch):
+    """An identical transcript is credited once per namespace, whether or not its verdict comes from the response cache."""
+    import json
+    import sqlite3
+    from glassbox.response_cache import ResponseCache
+    orch.cache = ResponseCache(str(tmp_path / "cache.db"))
+    verdicts = {"pragmatist": {"changed_mind": True, "influenced_by": "critic"}}
+    orch.backend._client = _FakeClient(reply=lambda model, system, user: json.dumps(verdicts) if "Analyze Round" in system else f"ok from {model}")
+    credit = db.credit_once
+    def fail(*args):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(db, "credit_once", fail)
+    with pytest.raises(sqlite3.OperationalError):  # verdict cached, crediting never ran
+        asyncio.run(orch.debate("Redis or Postgres?", parallel=True))
+    monkeypatch.setattr(db, "credit_once", credit)
+    outs = [asyncio.run(orch.debate("Redis or Postgres?", parallel=True, namespace=ns)) for ns in ("default", "default", "team-b")]
+    assert len(orch.backend._client.completions.calls) == 3 * 3 + 2
+    assert "persuaded @pragmatist" in outs[0] and "trust already credited" in outs[1] and "persuaded @pragmatist" in outs[2]
+    assert len(db.get_history("critic")) == len(db.get_history("critic", namespace="team-b")) == 1
+    assert db.get_trust("critic", "team-b") == db.get_trust("critic") > 0.85
+
+
+def test_84_response_cache_io_runs_off_the_loop(orch, tmp_path):
+    """The cache keeps one WAL connection, and _ask reaches it from a worker thread, never the event loop thread."""
+    import threading
+    from glassbox.response_cache import ResponseCache
+    orch.cache = cache = ResponseCache(str(tmp_path / "cache.db"))
+    assert cache._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    threads, get, put = [], cache.get, cache.put
+    cache.get = lambda *a: threads.append(threading.current_thread()) or get(*a)
+    cache.put = lambda *a: threads.append(threading.current_thread()) or put(*a)
+    async def run():
+        return [await orch._ask("architect", "sys", "hi") for _ in range(2)], threading.current_thread()
+    (first, second), loop_thread = asyncio.run(run())
+    assert first == second and len(orch.backend._client.completions.calls) == 1
+    assert len(threads) == 3 and loop_thread not in threads
+    cache.close()
+
+
+# ── Streaming Execute ─────────────────────────────────────────────────
+
+def _collect(agen):
+    async def go(): return [r async for r in agen]
+    return asyncio.run(go())
+
+
+def test_31_execute_stream_yields_in_completion_order(orch):
+    """Fast gpt-4o-mini critic arrives first; every agent still answers."""
+    orch.backend._client = _FakeClient(delay=lambda model: 0.01 if model == "gpt-4o-mini" else 0.05)
+    got = _collect(orch.execute_stream("Redis or Postgres?"))
+    assert got[0]["agent"] == "critic"
+    assert {r["agent"] for r in got} == {"architect", "pragmatist", "critic"}
+
+
+def test_32_execute_stream_early_return_cancels_slower_agents(orch, db):
+    """Once the highest-trust agent answers, slower agents are cancelled."""
+    db.update_trust("critic", True)
+    orch.backend._client = _FakeClient(delay=lambda model: 0.01 if model == "gpt-4o-mini" else 0.5)
+    got = _collect(orch.execute_stream("Redis or Postgres?", early_return=True))
+    assert [r["agent"] for r in got] == ["critic"]
+    assert orch.backend._client.completions.active == 0
+
+
+def test_33_analyze_tool_relays_progress(orch, monkeypatch):
+    """analyze sends one progress notification per agent answer."""
+    import glassbox.server as server
+    monkeypatch.setattr(server, "orch", orch)
+    progress = []
+    class Ctx:
+        async def report_progress(self, progress_, total, message): progress.append((progress_, total, message))
+    out = asyncio.run(server.analyze("Redis or Postgres?", ctx=Ctx()))
+    assert [p[:2] for p in progress] == [(1, 3), (2, 3), (3, 3)]
+    assert "Consensus" in out
+
+
+def test_85_early_return_waits_past_a_failed_leader(orch, db):
+    """A leader that times out doesn't end the stream; consensus falls to the best successful answer."""
+    from glassbox.hedging import HedgePolicy
+    db.update_trust("critic", True)
+    orch.hedging = HedgePolicy(deadlines={"critic": 0.01})
+    orch.backend._client = _FakeClient(delay=lambda model: 0.5 if model == "gpt-4o-mini" else 0.05)
+    got = _collect(orch.execute_stream("Redis or Postgres?", early_return=True))
+    assert {r["agent"] for r in got} == {"architect", "pragmatist", "critic"}
+    result = orch.build_result(got, {"hits": 0, "misses": 0})
+    assert result["consensus"] == "reply from gpt-4o"
+
+
+# ── Admission Control ─────────────────────────────────────────────────
+
+def test_34_admission_caps_concurrency_per_model(orch):
+    """Never more than the per-model limit in flight; the queue drains fully."""
+    from glassbox.admission import AdmissionController
+    orch.admission = AdmissionController({"gpt-4o": 2}, default_concurrency=2)
+    async def go(): return await asyncio.gather(*[orch._ask("architect", "sys", f"q{i}") for i in range(6)])
+    assert all(r == "reply from gpt-4o" for r in asyncio.run(go()))
+    assert orch.backend._client.completions.peak == 2
+    stats = orch.admission.stats()
+    assert stats["admitted"] == 6 and stats["queue_depth"] == 0 and stats["in_flight"] == 0
+    assert stats["max_wait_ms"] > 0
+
+
+def test_35_admission_rejects_fast_when_queue_full(orch):
+    """Callers beyond the bounded queue get an immediate retry-later result."""
+    from glassbox.admission import AdmissionController
+    orch.admission = AdmissionController({"gpt-4o": 1}, max_queue=2)
+    orch.backend._client = _FakeClient(delay=0.05)
+    async def go(): return await asyncio.gather(*[orch._ask("architect", "sys", f"q{i}") for i in range(5)])
+    results = asyncio.run(go())
+    assert sum(r.startswith("[RETRY LATER") for r in results) == 2
+    assert orch.admission.stats()["rejected"] == 2
+
+
+def test_36_token_bucket_limits_rate():
+    """An empty bucket reports the wait until enough tokens refill."""
+    from glassbox.admission import TokenBucket
+    bucket = TokenBucket(rate_per_minute=60)
+    assert bucket.wait_time(60) == 0
+    bucket.take(60)
+    assert 0.9 < bucket.wait_time(1) <= 1.0
+
+
+# ── Deadlines & Hedging ───────────────────────────────────────────────
+
+def test_37_ask_deadline_returns_timeout_error(orch):
+    """A stalled completion is cut off at the agent's deadline."""
+    from glassbox.hedging import HedgePolicy
+    orch.hedging = HedgePolicy(deadlines={"architect": 0.05})
+    orch.backend._client = _FakeClient(delay=1.0)
+    assert asyncio.run(orch._ask("architect", "sys", "hi")) == "[ERROR: architect timed out after 0.05s]"
+    assert orch.hedging.stats()["timeouts"] == 1
+
+
+def test_38_slow_call_is_hedged_to_fallback(orch):
+    """Past the tracked percentile, a duplicate goes to the fallback model and the first answer wins."""
+    from glassbox.hedging import HedgePolicy
+    orch.hedging = HedgePolicy(percentile=50, enabled=True)
+    for _ in range(20):
+        orch.hedging.latency.record("gpt-4o", 0.02)
+    orch.backend._client = _FakeClient(delay=lambda model: 0.5 if model == "gpt-4o" else 0.01)
+    assert asyncio.run(orch._ask("architect", "sys", "hi")) == "reply from gpt-4o-mini"
+    stats = orch.hedging.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1 and stats["hedge_rate"] == 1.0
+    assert orch.backend._client.completions.active == 0
+    assert len(orch.hedging.latency._samples["gpt-4o"]) == 21  # the cancelled primary still counts as a sample
+
+
+def test_39_no_hedge_before_enough_samples(orch):
+    """Without latency history there is no percentile, so no duplicate request is sent."""
+    asyncio.run(orch._ask("architect", "sys", "hi"))
+    assert len(orch.backend._client.completions.calls) == 1
+    assert orch.hedging.stats()["hedged"] == 0
+
+
+def test_86_hedged_answer_is_labelled_and_not_cached(orch, tmp_path):
+    """Hedging is opt-in; a fallback's answer is reported under the fallback model and never cached under the primary's key."""
+    from glassbox.hedging import HedgePolicy
+    from glassbox.response_cache import ResponseCache
+    assert not orch.hedging.enabled
+    orch.cache = ResponseCache(str(tmp_path / "cache.db"))
+    orch.hedging = HedgePolicy(percentile=50, enabled=True)
+    for _ in range(20):
+        orch.hedging.latency.record("gpt-4o", 0.02)
+    orch.backend._client = _FakeClient(delay=lambda model: 0.5 if model == "gpt-4o" else 0.01)
+    result = asyncio.run(orch.execute("Redis or Postgres?", ["architect"]))
+    assert result["agent_responses"][0]["model"] == "gpt-4o-mini"
+    assert len(orch.cache) == 0
+    orch.cache.close()
+
+
+def test_89_no_hedge_under_saturated_admission(orch):
+    """Time queued for admission doesn't start the hedge clock, and no duplicate is sent while calls are queued."""
+    from glassbox.admission import AdmissionController
+    from glassbox.hedging import HedgePolicy
+    orch.admission = AdmissionController(model_concurrency={"gpt-4o": 1})
+    orch.hedging = HedgePolicy(percentile=50, enabled=True)
+    for _ in range(20):
+        orch.hedging.latency.record("gpt-4o", 0.05)
+    orch.backend._client = _FakeClient(delay=0.01)
+    async def go():
+        return await asyncio.gather(*[orch._ask("architect", "sys", f"q{i}") for i in range(10)])
+    assert all(r == "reply from gpt-4o" for r in asyncio.run(go()))
+    assert orch.hedging.stats()["hedged"] == 0 and orch.admission.stats()["max_wait_ms"] > 50
+    assert {c["model"] for c in orch.backend._client.completions.calls} == {"gpt-4o"}
+
+
+# ── Batch Execution ───────────────────────────────────────────────────
+
+def test_40_execute_many_bounded_and_ordered(orch, db):
+    """All (task, agent) pairs share one bounded pool; JSONL comes out in task order."""
+    import io, json
+    orch.backend._client = _FakeClient(delay=0.01, reply=lambda m, s, u: f"{u} by {m}")
+    sink = io.StringIO()
+    tasks = [f"task {i}" for i in range(10)]
+    results = asyncio.run(orch.execute_many(tasks, ["architect", "critic"], max_concurrency=4, sink=sink))
+    assert orch.backend._client.completions.peak == 4
+    assert len(orch.backend._client.completions.calls) == 20
+    lines = [json.loads(l) for l in sink.getvalue().splitlines()]
+    assert [l["task"] for l in lines] == tasks == [r["task"] for r in results]
+    assert lines[3]["agent_responses"][0]["response"] == "task 3 by gpt-4o"
+
+
+def test_41_batch_cli_reads_tasks_file(tmp_path):
+    """load_tasks accepts plain lines and JSONL objects, skipping blanks."""
+    from glassbox.batch import load_tasks
+    path = tmp_path / "tasks.txt"
+    path.write_text('Redis or Postgres?\n\n{"task": "Monolith or services?"}\n')
+    assert load_tasks(str(path)) == ["Redis or Postgres?", "Monolith or services?"]
+
+
+# ── Adaptive Debate ───────────────────────────────────────────────────
+
+def test_42_convergence_similarity_and_dissent():
+    """Near-identical positions converge; explicit disagreement blocks it."""
+    from glassbox.convergence import converged, similarity
+    same = "Use Postgres with a read replica and cache hot keys in Redis."
+    assert similarity(same, same) > 0.99
+    assert converged([same, same + " Ship it this week."])[0]
+    assert not converged([same, "I disagree with @architect: " + same])[0]
+    assert not converged([same, "Rewrite everything in Rust on bare metal servers."])[0]
+
+
+def test_43_adaptive_debate_stops_when_converged(orch):
+    """Agreeing agents stop after round 1 and the output reports rounds run and tokens saved."""
+    orch.backend._client = _FakeClient(reply=lambda m, s, u: "Use Postgres with a read replica and cache hot keys." if "ROUND" in u else "{}")
+    out = asyncio.run(orch.debate("Redis or Postgres?", parallel=True, adaptive=True))
+    assert len(orch.backend._client.completions.calls) == 3 + 2
+    assert "ran 1/3 rounds" in out and "tokens saved" in out
+    assert "Analyze Round 1" in orch.backend._client.completions.calls[-1]["system"] + orch.backend._client.completions.calls[-2]["system"]
+
+
+def test_44_adaptive_debate_runs_all_rounds_on_disagreement(orch):
+    """Divergent positions keep the full three rounds."""
+    replies = iter(["Postgres all the way.", "I disagree with @architect, Redis is faster.", "Mongo scales horizontally."] * 3)
+    orch.backend._client = _FakeClient(reply=lambda m, s, u: next(replies) if "ROUND" in u else "{}")
+    out = asyncio.run(orch.debate("Redis or Postgres?", adaptive=True))
+    assert "EARLY STOP" not in out
+    assert len(orch.backend._client.completions.calls) == 9 + 2
+
+
+# ── Metrics Registry ──────────────────────────────────────────────────
+
+def test_45_metrics_record_every_ask(orch):
+    """Each _ask lands in the per-agent, per-tool and per-model histograms with tokens and errors."""
+    from glassbox.metrics import tool_scope
+    async def go():
+        with tool_scope("analyze"):
+            await orch.execute("Redis or Postgres?")
+    asyncio.run(go())
+    asyncio.run(orch._ask("ghost", "sys", "hi"))
+    snap = orch.metrics.snapshot()
+    assert snap["latency"]["tool"]["analyze"]["count"] == 3
+    assert set(snap["latency"]["agent"]) == {"architect", "pragmatist", "critic", "ghost"}
+    assert snap["latency"]["model"]["gpt-4o"]["count"] == 2
+    assert snap["tokens"]["architect"]["prompt"] > 0 and snap["tokens"]["architect"]["completion"] > 0
+    assert snap["errors"] == {"ghost": {"KeyError": 1}}
+    assert "p95=" in orch.metrics.format_text()
+
+
+def test_46_metrics_prometheus_dump(orch):
+    """Prometheus dump has quantiles, counters and extra gauges."""
+    asyncio.run(orch._ask("critic", "sys", "hi"))
+    text = orch.metrics.prometheus({"admission_queue_depth": 0})
+    assert 'glassbox_llm_latency_seconds{agent="critic",quantile="0.99"}' in text
+    assert 'glassbox_llm_calls_total{agent="critic",model="gpt-4o-mini",tool="direct"} 1' in text
+    assert "glassbox_admission_queue_depth 0" in text
+
+
+def test_47_metrics_tool_registered(orch, monkeypatch):
+    """metrics MCP tool is importable and returns text."""
+    from glassbox import server
+    from glassbox.server import metrics
+    monkeypatch.setattr(server, "orch", orch)
+    assert isinstance(metrics(), str)
+    assert metrics("prometheus").startswith("# TYPE")
+
+
+def test_87_cache_hits_stay_out_of_latency(orch, tmp_path):
+    """A response-cache hit counts as a hit and a call, but not as a latency sample."""
+    from glassbox.response_cache import ResponseCache
+    orch.cache = ResponseCache(str(tmp_path / "cache.db"))
+    for _ in range(3):
+        asyncio.run(orch._ask("critic", "sys", "hi"))
+    snap = orch.metrics.snapshot()
+    assert snap["cache_hits"] == {"critic": 2}
+    assert snap["latency"]["agent"]["critic"]["count"] == 1
+    orch.cache.close()
+
+
+# ── Pluggable Backends & Stub Server ─────────────────────────────────
+
+def test_48_stub_backend_runs_full_debate(db):
+    """Orchestrator runs a debate offline on StubBackend with templated replies."""
+    from glassbox.backends import StubBackend, StubProfile
+    from glassbox.orchestrator import MultiAgentOrchestrator
+    o = MultiAgentOrchestrator(cache_path=None, debate_path=None, backend=StubBackend(StubProfile("fixed:0.001", seed=1)), trust_db=db)
+    out = asyncio.run(o.debate("Redis or Postgres?", parallel=True))
+    assert "@critic [gpt-4o-mini] on Redis or Postgres?" in out
+    assert "Converged plan for Redis or Postgres?" in out
+    assert sum(o.metrics.errors.values()) == 0
+
+
+def test_49_stub_profile_error_rate_and_latency():
+    """Injected errors follow error_rate; latency specs are validated."""
+    from glassbox.backends import StubProfile
+    p = StubProfile("uniform:0.1,0.2", error_rate=0.25, seed=7)
+    assert all(0.1 <= p.sample_latency() <= 0.2 for _ in range(100))
+    assert 150 < sum(p.should_fail() for _ in range(1000)) < 350
+    with pytest.raises(ValueError):
+        StubProfile("pareto:1")
+
+
+def test_50_stub_server_speaks_openai_protocol(db):
+    """The real AsyncOpenAI client talks to the stub HTTP server."""
+    from glassbox.backends import OpenAIBackend, StubProfile
+    from glassbox.orchestrator import MultiAgentOrchestrator
+    from glassbox.stub_server import StubServer
+    async def go():
+        server = await StubServer(StubProfile("fixed:0.001"), port=0).start()
+        backend = OpenAIBackend(api_key="stub", base_url=server.base_url)
+        o = MultiAgentOrchestrator(cache_path=None, debate_path=None, backend=backend, trust_db=db)
+        try:
+            result = await o.execute("Redis or Postgres?")
+        finally:
+            await backend.aclose()
+            await server.stop()
+        return result, server, o
+    result, server, o = asyncio.run(go())
+    assert server.requests == 3
+    assert all("[ERROR" not in r["response"] for r in result["agent_responses"])
+    assert o.metrics.snapshot()["tokens"]["architect"]["prompt"] > 0
+
+
+def test_51_hedge_skipped_when_primary_beats_percentile(orch):
+    """A primary that answers before the hedge delay is returned without a duplicate."""
+    from glassbox.hedging import HedgePolicy
+    orch.hedging = HedgePolicy(percentile=50, enabled=True)
+    for _ in range(20):
+        orch.hedging.latency.record("gpt-4o", 0.5)
+    assert asyncio.run(orch._ask("architect", "sys", "hi")) == "reply from gpt-4o"
+    assert orch.hedging.stats()["hedged"] == 0
+
+
+# ── TrustDB: Connection Management ────────────────────────────────────
+
+def test_52_trust_db_uses_wal_and_one_connection(db):
+    """The managed connection runs in WAL mode and is reused across calls."""
+    conn = db._conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    db.update_trust("architect", True)
+    db.get_all_scores()
+    assert db._conn is conn
+
+
+def test_53_trust_db_thread_safe_updates(db):
+    """Updates from many worker threads all land."""
+    import threading
+    threads = [threading.Thread(target=lambda: [db.update_trust("critic", True) for _ in range(25)]) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert db.get_stats("critic")["total_count"] == 200
+
+
+# ── TrustDB: Write-back Cache ─────────────────────────────────────────
+
+@pytest.fixture
+def db_path():
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        path = f.name
+    yield path
+    os.unlink(path)
+
+
+def test_54_write_back_serves_memory_and_flushes_at_threshold(db_path):
+    """Updates are visible immediately but only reach SQLite once the dirty threshold is hit."""
+    wb = TrustDB(db_path, write_back=True, flush_interval=60, flush_threshold=3)
+    disk = TrustDB(db_path)
+    wb.update_trust("architect", True)
+    wb.update_trust("architect", True)
+    assert wb.get_trust("architect") > 0.85
+    assert disk.get_trust("architect") == 0.85
+    wb.update_trust("critic", False)
+    assert disk.get_stats("architect")["total_count"] == 2
+    assert disk.get_trust("critic") < 0.85
+    wb.close()
+    disk.close()
+
+
+def test_55_write_back_flushes_on_interval_and_close(db_path):
+    """The background flusher and close() both persist pending updates."""
+    import time
+    wb = TrustDB(db_path, write_back=True, flush_interval=0.05, flush_threshold=1000)
+    wb.update_trust("pragmatist", True)
+    time.sleep(0.2)
+    disk = TrustDB(db_path)
+    assert disk.get_stats("pragmatist")["total_count"] == 1
+    wb.update_trust("pragmatist", True)
+    wb.close()
+    assert disk.get_stats("pragmatist")["total_count"] == 2
+    disk.close()
+
+
+def test_56_write_back_sees_other_process_writes(db_path):
+    """data_version detects commits from another connection within sync_interval."""
+    wb = TrustDB(db_path, write_back=True, flush_interval=60, sync_interval=0)
+    other = TrustDB(db_path)
+    assert wb.get_trust("critic") == 0.85
+    other.update_trust("critic", True)
+    assert wb.get_trust("critic") == other.get_trust("critic") > 0.85
+    wb.close()
+    other.close()
+
+
+def test_57_write_back_matches_direct_ema(db_path, db):
+    """Cached EMA arithmetic matches the SQLite path exactly."""
+    wb = TrustDB(db_path, write_back=True, flush_interval=60)
+    for i in range(30):
+        wb.update_trust("architect", i % 3 != 0)
+        db.update_trust("architect", i % 3 != 0)
+    assert wb.get_stats("architect") == db.get_stats("architect")
+    wb.close()
+
+
+def test_88_write_back_loads_namespaces_on_demand(db_path):
+    """Write-back caches only the namespaces it has used; another writer's commit reloads them one at a time."""
+    other = TrustDB(db_path)
+    other.update_trust_many([(f"agent-{i}", i % 2 == 0) for i in range(50)], namespace="team-a")
+    other.update_trust("critic", True, namespace="team-b")
+    wb = TrustDB(db_path, write_back=True, flush_interval=60, sync_interval=0)
+    assert list(wb.get_all_scores("team-b", limit=1)) == ["critic"]
+    assert set(wb._cache) == {"team-b"}
+    wb.update_trust("architect", False, namespace="team-b")
+    other.update_trust("critic", True, namespace="team-b")
+    assert wb.get_trust("critic", "team-b") == other.get_trust("critic", "team-b")
+    assert wb.get_trust("architect", "team-b") < 0.85  # unflushed local update survives the reload
+    wb.close()
+    other.close()
+
+
+def test_90_write_back_flushes_from_two_processes_both_land(db_path, db):
+    """Two write-back writers on one file: each flush applies its own outcomes on top of the other's."""
+    a = TrustDB(db_path, write_back=True, flush_interval=60)
+    b = TrustDB(db_path, write_back=True, flush_interval=60)
+    a.update_trust("critic", True)
+    b.update_trust("critic", True)
+    a.flush()
+    b.flush()
+    db.update_trust("critic", True)
+    db.update_trust("critic", True)
+    assert a.get_stats("critic")["total_count"] == 2 and a.get_stats("critic") == db.get_stats("critic")
+    assert a._conn.execute("SELECT COUNT(*) FROM trust_events WHERE agent = 'critic'").fetchone()[0] == 2
+    a.close()
+    b.close()
+
+
+# ── TrustDB: Atomic Updates ───────────────────────────────────────────
+
+def test_58_update_trust_returns_new_score(db):
+    """update_trust returns the post-update score in one call."""
+    new = db.update_trust("architect", True)
+    assert new == db.get_trust("architect") == pytest.approx(0.865)
+    assert db.update_trust("brand_new", False) == pytest.approx(0.765)
+
+
+def test_59_concurrent_connections_lose_no_updates(db_path):
+    """Separate connections hammering one agent: every increment and EMA step lands."""
+    import threading
+    dbs = [TrustDB(db_path) for _ in range(6)]
+    def hammer(d):
+        for _ in range(40):
+            d.update_trust("critic", True)
+    threads = [threading.Thread(target=hammer, args=(d,)) for d in dbs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    expected = 0.85
+    for _ in range(240):
+        expected = max(0.3, min(1.0, expected + 0.1 * (1.0 - expected)))
+    stats = dbs[0].get_stats("critic")
+    assert stats["total_count"] == stats["correct_count"] == 240
+    assert stats["trust_score"] == pytest.approx(expected)
+    for d in dbs:
+        d.close()
+
+
+# ── TrustDB: Event Log ────────────────────────────────────────────────
+
+def test_60_update_trust_appends_event(db):
+    """Each update writes one event carrying the post-update score."""
+    s1 = db.update_trust("architect", True)
+    s2 = db.update_trust("architect", False)
+    history = db.get_history("architect")
+    assert [(e["was_correct"], e["score"]) for e in history] == [(False, s2), (True, s1)]
+    plan = " ".join(r[-1] for r in db._conn.execute("EXPLAIN QUERY PLAN SELECT ts, was_correct, score FROM trust_events WHERE namespace = 'default' AND agent = 'architect' AND ts >= 0"))
+    assert "COVERING INDEX idx_trust_events_ns_agent_ts" in plan
+
+
+def test_61_series_downsamples_window(db):
+    """get_series buckets events inside the window; events outside are ignored."""
+    import time
+    now = time.time()
+    db._conn.executemany("INSERT INTO trust_events (agent, ts, was_correct, score) VALUES ('critic', ?, ?, ?)",
+                         [(now - 3600 + i * 36, i % 2, 0.5 + i / 1000) for i in range(100)] + [(now - 7200, 1, 0.9)])
+    series = db.get_series("critic", now - 3600, now, buckets=4)
+    assert len(series) == 4
+    assert sum(b["events"] for b in series) == 100
+    assert series[0]["min_score"] == pytest.approx(0.5)
+
+
+def test_62_compact_events_keeps_table_bounded(db):
+    """Retention drops old events and caps each agent's history."""
+    import time
+    now = time.time()
+    db._conn.executemany("INSERT INTO trust_events (agent, ts, was_correct, score) VALUES ('pragmatist', ?, 1, 0.9)",
+                         [(now - 10 * 86400,)] + [(now - i,) for i in range(50)])
+    assert db.compact_events(max_age=86400, max_per_agent=20) == 31
+    assert len(db.get_history("pragmatist")) == 20
+
+
+def test_63_write_back_batches_events_into_flush(db_path):
+    """Write-back mode logs events with the batched flush, not per update."""
+    wb = TrustDB(db_path, write_back=True, flush_interval=60, flush_threshold=1000)
+    for _ in range(5):
+        wb.update_trust("critic", True)
+    assert wb._conn.execute("SELECT COUNT(*) FROM trust_events").fetchone()[0] == 0
+    assert len(wb.get_history("critic")) == 5
+    wb.close()
+
+
+def _naive_replay(log, alpha, floor, ceiling):
+    scores, brier = {}, 0.0
+    for agent, outcome in zip(log.agent_idx, log.outcome):
+        s = scores.get(agent, 0.85)
+        brier += (s - outcome) ** 2
+        scores[agent] = max(floor, min(ceiling, s + alpha * (outcome - s)))
+    return scores, brier / len(log.outcome)
+
+
+def test_64_replay_matches_sequential_ema():
+    """The vectorized replay reproduces the per-event EMA loop for every grid point."""
+    pytest.importorskip("numpy")
+    from glassbox.replay import replay, synthetic_events
+    log = synthetic_events(3001, n_agents=4, seed=7)
+    result = replay(log, alphas=[0.05, 0.1, 0.5], floors=[0.3, 0.6], ceilings=[0.9, 1.0])
+    assert len(result.params) == 12
+    for g, (alpha, floor, ceiling) in enumerate(result.params):
+        scores, brier = _naive_replay(log, alpha, floor, ceiling)
+        assert result.brier[g] == pytest.approx(brier)
+        assert list(result.final_scores[g]) == pytest.approx([scores[i] for i in range(4)])
+    assert result.ranked()[0]["brier"] == pytest.approx(result.brier.min())
+
+
+def test_65_replay_loads_trust_events(db):
+    """Replaying the live parameters over logged events reproduces the recorded scores."""
+    pytest.importorskip("numpy")
+    from glassbox.replay import load_events, replay
+    for i in range(40):
+        db.update_trust(("architect", "critic")[i % 2], i % 3 != 0)
+    log = load_events(db.db_path)
+    assert log.agents == ["architect", "critic"] and len(log.outcome) == 40
+    result = replay(log, alphas=[0.1], floors=[0.3], ceilings=[1.0])
+    assert result.final_scores[0] == pytest.approx([db.get_trust("architect"), db.get_trust("critic")])
+    assert result.brier[0] == pytest.approx(result.actual_brier)
+
+
+def test_66_async_trust_db_keeps_loop_responsive(db):
+    """Slow commits run on the DB thread: the loop keeps ticking and writes land in submission order."""
+    import time
+    from glassbox.trust_db import AsyncTrustDB
+    real_update = db.update_trust
+    def slow_update(*args):
+        time.sleep(0.02)  # a slow fsync
+        return real_update(*args)
+    db.update_trust = slow_update
+    adb = AsyncTrustDB(db)
+
+    async def run():
+        gaps, stop = [], asyncio.Event()
+        async def ticker():
+            last = time.perf_counter()
+            while not stop.is_set():
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+        tick = asyncio.create_task(ticker())
+        outcomes = [i % 3 != 0 for i in range(15)]
+        scores = await asyncio.gather(*[adb.update_trust("critic", ok) for ok in outcomes])
+        final = await adb.get_trust("critic")
+        stop.set()
+        await tick
+        return outcomes, scores, final, gaps
+
+    outcomes, scores, final, gaps = asyncio.run(run())
+    adb._executor.shutdown()
+    assert max(gaps) < 0.1  # 15 blocking updates take >= 0.3s in total
+    assert [e["was_correct"] for e in reversed(db.get_history("critic"))] == outcomes
+    expected, s = [], 0.85
+    for ok in outcomes:
+        s = max(0.3, min(1.0, s + 0.1 * (ok - s)))
+        expected.append(s)
+    assert scores == pytest.approx(expected) and final == scores[-1]
+
+
+def test_67_bulk_trust_reads_and_updates(db):
+    """get_trust_many reads many agents at once; update_trust_many applies outcomes in order like update_trust."""
+    assert db.get_trust_many(["critic", "ghost"]) == {"critic": 0.85, "ghost": 0.85}
+    scores = db.update_trust_many([("critic", True), ("critic", False), ("agent_20", True)])
+    assert scores[1] == pytest.approx(0.1 * 0.0 + 0.9 * scores[0])
+    assert db.get_trust_many(["critic", "agent_20"]) == {"critic": scores[1], "agent_20": scores[2]}
+    assert len(db.get_history("critic")) == 2
+
+
+def test_68_update_trust_many_is_one_transaction(db):
+    """A failing outcome rolls back the whole batch, so no agent is half-updated."""
+    import sqlite3
+    with pytest.raises(sqlite3.IntegrityError):
+        db.update_trust_many([("critic", True), (None, True)])  # trust_events.agent is NOT NULL
+    assert db.get_trust("critic") == 0.85
+    assert db.get_history("critic") == []
+
+
+def test_69_namespaces_isolate_scores_and_page_top_k(db):
+    """Each namespace has its own lazily seeded agents; get_all_scores pages by rank straight off the index."""
+    db.update_trust_many([(f"bot{i:02d}", i % 2 == 0) for i in range(30)], namespace="repo-a")
+    assert db.get_trust("bot00") == 0.85 and db.get_trust("bot00", namespace="repo-a") > 0.85
+    assert set(db.get_all_scores("team-b")) == {"architect", "pragmatist", "critic"}
+    page1, page2 = db.get_all_scores("repo-a", limit=5), db.get_all_scores("repo-a", limit=5, offset=5)
+    ranked = list(db.get_all_scores("repo-a").items())
+    assert list(page1.items()) + list(page2.items()) == ranked[:10]
+    assert len(ranked) == 33 and ranked == sorted(ranked, key=lambda x: (-x[1], x[0]))
+    plan = " ".join(r[-1] for r in db._conn.execute("EXPLAIN QUERY PLAN SELECT agent, score FROM trust_scores WHERE namespace = 'repo-a' ORDER BY score DESC, agent LIMIT 5"))
+    assert "idx_trust_scores_rank" in plan and "TEMP B-TREE" not in plan
+
+
+def test_70_trust_db_migrates_unnamespaced_file(db_path):
+    """A pre-namespace file opens with its scores and events moved into the default namespace."""
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE trust_scores (agent TEXT PRIMARY KEY, score REAL DEFAULT 0.85, correct_count INTEGER DEFAULT 0, total_count INTEGER DEFAULT 0, last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    conn.execute("INSERT INTO trust_scores (agent, score, correct_count, total_count) VALUES ('critic', 0.42, 1, 5)")
+    conn.execute("CREATE TABLE trust_events (id INTEGER PRIMARY KEY, agent TEXT NOT NULL, ts REAL NOT NULL, was_correct INTEGER NOT NULL, score REAL NOT NULL)")
+    conn.execute("CREATE INDEX idx_trust_events_agent_ts ON trust_events (agent, ts, was_correct, score)")
+    conn.execute("INSERT INTO trust_events (agent, ts, was_correct, score) VALUES ('critic', 1.0, 0, 0.42)")
+    conn.commit()
+    conn.close()
+    with TrustDB(db_path) as t:
+        assert t.get_stats("critic")["trust_score"] == 0.42 and t.get_stats("critic")["total_count"] == 5
+        assert t.get_history("critic") == [{"ts": 1.0, "was_correct": False, "score": 0.42}]
+        assert t._conn.execute("PRAGMA user_version").fetchone()[0] == 2
+        assert t.update_trust("critic", True, namespace="other") > 0.85
+    with TrustDB(db_path) as t:  # reopening a migrated file is a no-op
+        assert t.get_trust("critic") == 0.42
+
+
+# ── Cold Start ───────────────────────────────────────────────────────
+
+def test_71_server_import_is_cheap_and_side_effect_free(tmp_path):
+    """Importing the server defers openai, the keychain and SQLite setup; glassbox's own import stays within budget."""
+    import subprocess
+    code = ("import sys, time; import mcp.server.fastmcp; t = time.perf_counter(); import glassbox.server as s; "
+            "print(time.perf_counter() - t, 'openai' in sys.modules, s.orch is None)")
+    env = {**os.environ, "PYTHONPATH": os.path.join(os.path.dirname(__file__), "..", "src")}
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True, check=True).stdout.split()
+    assert float(out[0]) < 0.5  # ~40ms locally; mcp itself is imported before the clock starts
+    assert out[1:] == ["False", "True"]
+    assert list(tmp_path.iterdir()) == []  # no trust_scores.db / response_cache.db until the first tool call
+
+
+def test_72_lifespan_prewarms_backend(orch, monkeypatch):
+    """Starting the server builds the orchestrator off the loop and warms the LLM connection in the background."""
+    import glassbox.server as server
+    monkeypatch.setattr(server, "orch", orch)
+    warmed = []
+    async def warm(): warmed.append(True)
+    monkeypatch.setattr(orch.backend, "warm", warm)
+    async def run():
+        async with server.lifespan(server.mcp):
+            for _ in range(100):
+                if warmed:
+                    break
+                await asyncio.sleep(0.01)
+    asyncio.run(run())
+    assert warmed == [True]
+
+
+def test_73_http_app_serves_clients_and_shuts_down_cleanly(orch, monkeypatch):
+    """Streamable-HTTP app answers tool calls from the shared orchestrator; shutdown closes the LLM client and trust store."""
+    import httpx
+    import glassbox.server as server
+    monkeypatch.setattr(server, "orch", orch)
+    monkeypatch.setattr(server.mcp, "_session_manager", None)
+    monkeypatch.setattr(server.mcp.settings, "stateless_http", False)
+    monkeypatch.setenv("GLASSBOX_PREWARM", "0")
+    closed = []
+    async def aclose(): closed.append("backend")
+    monkeypatch.setattr(orch.backend, "aclose", aclose)
+    app = server.http_app("streamable-http", stateless=True)
+    call = {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "update_trust", "arguments": {"agent": "critic", "was_correct": True}}}
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app), base_url="http://127.0.0.1:8000") as client:
+                replies = await asyncio.gather(*[client.post("/mcp", json=call, headers={"accept": "application/json, text/event-stream"}) for _ in range(5)])
+            return replies, len(orch.trust_db.get_history("critic"))
+
+    replies, events = asyncio.run(run())
+    assert all(r.status_code == 200 and "critic" in r.text for r in replies)
+    assert events == 5
+    assert closed == ["backend"] and orch.trust._executor._shutdown
+
+
+# ── Single-flight ─────────────────────────────────────────────────────
+
+def test_74_identical_concurrent_requests_share_one_run(orch):
+    """Concurrent identical execute / execute_stream / debate calls send one set of LLM calls; no_cache opts out."""
+    orch.backend._client = _FakeClient(delay=0.05)
+    calls = orch.backend._client.completions.calls
+    async def stream(): return [r async for r in orch.execute_stream("Redis or Postgres?")]
+    async def run():
+        executed = await asyncio.gather(*[orch.execute("Redis or Postgres?") for _ in range(5)])
+        assert len(calls) == 3 and all(r == executed[0] for r in executed)
+        streamed = await asyncio.gather(*[stream() for _ in range(4)])
+        assert len(calls) == 6 and all(len(s) == 3 for s in streamed)
+        debates = await asyncio.gather(*[orch.debate("Redis or Postgres?", parallel=True) for _ in range(3)])
+        assert len(calls) == 6 + 3 * 3 + 2 and len(set(debates)) == 1
+        await asyncio.gather(*[orch.execute("Redis or Postgres?", use_cache=False) for _ in range(2)])
+        assert len(calls) == 6 + 11 + 6
+    asyncio.run(run())
+    stats = orch.flights.stats()
+    assert stats["in_flight"] == 0 and stats["joined"] == 4 + 3 * 3 + 2 and stats["abandoned"] == 0
+
+
+def test_75_cancelled_caller_detaches_from_shared_call(orch):
+    """One caller dropping out leaves the shared call running for the rest; the last one leaving cancels it."""
+    orch.backend._client = _FakeClient(delay=0.2)
+    completions = orch.backend._client.completions
+    async def run():
+        first, second = [asyncio.ensure_future(orch._ask("architect", "sys", "hi")) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        first.cancel()
+        assert await second == "reply from gpt-4o" and first.cancelled()
+        lone = asyncio.ensure_future(orch._ask("architect", "sys", "bye"))
+        await asyncio.sleep(0.05)
+        lone.cancel()
+        await asyncio.sleep(0.01)
+        return completions.active
+    assert asyncio.run(run()) == 0
+    assert len(completions.calls) == 2
+    assert orch.flights.stats() == {"in_flight": 0, "leaders": 2, "joined": 1, "coalesce_rate": 1 / 3, "abandoned": 1}
+
+
+# ── Background Jobs ───────────────────────────────────────────────────
+
+def test_76_debate_job_runs_in_background_and_dedupes(orch, monkeypatch):
+    """debate_submit returns at once; status shows the transcript so far; resubmitting attaches to the same job."""
+    import glassbox.server as server
+    from glassbox.jobs import JobManager
+    monkeypatch.setattr(server, "orch", orch)
+    monkeypatch.setattr(server, "jobs", JobManager())
+    orch.backend._client = _FakeClient(delay=0.05)
+    async def run():
+        submitted = await server.debate_submit("Redis or Postgres?")
+        job_id = submitted.split()[1].rstrip(":")
+        assert "running" in submitted and await server.debate_submit("Redis or Postgres?") == submitted
+        while "ROUND 1" not in server.debate_status(job_id):
+            await asyncio.sleep(0.01)
+        assert "running" in await server.debate_result(job_id)
+        result = await server.debate_result(job_id, wait=5)
+        assert (await server.debate_submit("Redis or Postgres?")).startswith(f"Job {job_id}: done")
+        return result
+    result = asyncio.run(run())
+    assert "━━ CONVERGENCE ━━" in result and len(orch.backend._client.completions.calls) == 3 * 3 + 2
+    assert server.jobs.stats() == {"running": 0, "finished": 1, "submitted": 1, "deduped": 2, "evicted": 0}
+    assert server.debate_status("nope") == "No job nope (unknown or expired)."
+
+
+def test_77_job_table_is_bounded_and_expires(monkeypatch):
+    """A full table of running jobs rejects new work; finished jobs go oldest-first, or after the TTL."""
+    from glassbox.jobs import JobManager, JobTableFull
+    jobs = JobManager(max_jobs=2, ttl=60)
+    async def run():
+        gate = asyncio.Event()
+        async def slow(progress):
+            await gate.wait()
+            return "ok"
+        a, b = jobs.submit("a", slow), jobs.submit("b", slow)
+        with pytest.raises(JobTableFull):
+            jobs.submit("c", slow)
+        gate.set()
+        await jobs.wait(a, 1)
+        await jobs.wait(b, 1)
+        c = jobs.submit("c", slow)  # evicts a, the oldest finished job
+        await jobs.wait(c, 1)
+        return a, b, c
+    a, b, c = asyncio.run(run())
+    assert jobs.get(a.id) is None and jobs.get(b.id).result == "ok" and c.status == "done"
+    monkeypatch.setattr("glassbox.jobs.time.time", lambda: c.finished + 61)
+    assert jobs.get(c.id) is None and jobs.stats()["evicted"] == 3
+
+
+# ── Cancellation ──────────────────────────────────────────────────────
+
+def test_78_cancelled_requests_release_slots_promptly(orch, monkeypatch):
+    """Cancelling execute, analyze, a debate or a debate job cancels every outstanding LLM call: by the time the
+    cancelled caller returns, no admission slot, queued waiter or backend request is left."""
+    import glassbox.server as server
+    from glassbox.admission import AdmissionController
+    from glassbox.jobs import JobManager
+    monkeypatch.setattr(server, "orch", orch)
+    monkeypatch.setattr(server, "jobs", JobManager())
+    orch.admission = AdmissionController(model_concurrency={"gpt-4o": 1, "gpt-4o-mini": 1})
+    orch.backend._client = _FakeClient(delay=5.0)
+    completions = orch.backend._client.completions
+    def idle():
+        stats = orch.admission.stats()
+        return stats["in_flight"] == stats["queue_depth"] == completions.active == orch.flights.in_flight() == 0
+    async def cancel(coro):
+        t = asyncio.ensure_future(coro)
+        await asyncio.sleep(0.05)
+        assert completions.active and orch.admission.stats()["queue_depth"]
+        t.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await t
+        return idle()
+    async def run():
+        assert await cancel(orch.execute("Redis or Postgres?"))
+        assert await cancel(server.analyze("Redis or Postgres?", no_cache=True))
+        assert await cancel(orch.debate("Redis or Postgres?", parallel=True))
+        job_id = (await server.debate_submit("Redis or Postgres?")).split()[1].rstrip(":")
+        await asyncio.sleep(0.05)
+        assert "cancelled" in await server.debate_cancel(job_id) and idle()
+    asyncio.run(run())
+    assert len(completions.calls) == 8
+
+
+def test_79_cancelled_debate_applies_judge_update_whole(orch, db, monkeypatch):
+    """A debate cancelled while the judge's trust update is running still lands every persuasion, never half."""
+    import json
+    import threading
+    import time as _time
+    verdicts = {"pragmatist": {"changed_mind": True, "influenced_by": "critic"}, "critic": {"changed_mind": True, "influenced_by": "architect"}}
+    orch.backend._client = _FakeClient(reply=lambda model, system, user: json.dumps(verdicts) if "Analyze Round" in system else "ok")
+    started, update = threading.Event(), db.credit_once
+    def slow_update(*args):
+        started.set()
+        _time.sleep(0.1)
+        return update(*args)
+    monkeypatch.setattr(db, "credit_once", slow_update)
+    async def run():
+        t = asyncio.ensure_future(orch.debate("Redis or Postgres?", parallel=True))
+        while not started.is_set():
+            await asyncio.sleep(0.005)
+        t.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await t
+        await orch.trust.run(lambda: None)  # drain the trust thread
+    asyncio.run(run())
+    assert db.get_trust("critic") > 0.85 and db.get_trust("architect") > 0.85
+    assert len(db.get_history("critic")) == len(db.get_history("architect")) == 1
+
+
+# ── Debate Continuation ───────────────────────────────────────────────
+
+def test_80_debate_continue_adds_rounds_on_stored_digests(orch, tmp_path):
+    """A finished debate is stored by ID; a follow-up runs one round on the stored digests plus one summary/judge wave."""
+    import re
+    from glassbox.debate_store import DebateStore
+    orch.debates = DebateStore(str(tmp_path / "debates.db"))
+    assert orch.debates._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    first = asyncio.run(orch.debate("Redis or Postgres?", parallel=True))
+    debate_id = re.search(r"━━ DEBATE (\w+) ━━", first).group(1)
+    calls = orch.backend._client.completions.calls
+    assert len(calls) == 3 * 3 + 2
+    out = asyncio.run(orch.debate_continue(debate_id, "Now consider the cost constraint."))
+    follow_up = calls[11:]
+    assert len(follow_up) == 3 + 2 and "━━ ROUND 4 ━━" in out and f"━━ DEBATE {debate_id} ━━" in out
+    prompt = follow_up[0]["user"]
+    assert "[Round 1 digest]" in prompt and "[Round 2 digest]" in prompt and "cost constraint" in prompt
+    assert "Round 3 digest" not in prompt
+    state = orch.debates.load(debate_id)
+    assert len(state["transcript"]["rounds"]) == 4 and state["labels"][-1].startswith("ROUND 4: Follow-up")
+    assert set(state["transcript"]["digests"]) == {"0", "1"}
+    assert "ROUND 5" in asyncio.run(orch.debate_continue(debate_id, "And the team's Postgres experience?"))
+    asyncio.run(orch.debate_continue(debate_id, "Anything else?", rounds=50))
+    assert len(orch.debates.load(debate_id)["transcript"]["rounds"]) == 5 + 3  # clamped to MAX_FOLLOW_UP_ROUNDS
+    with pytest.raises(KeyError):
+        asyncio.run(orch.debate_continue("missing", "anything"))
+    orch.debates.close()
+
+
+# ── Agent Selection ───────────────────────────────────────────────────
+
+def test_81_selection_queries_top_k_by_trust(orch, db, caplog):
+    """top_k asks only the highest-trust agents of the default panel and logs the cut; named agents are always asked."""
+    import logging
+    from glassbox.selection import SelectionPolicy
+    db.update_trust("critic", False)
+    orch.selection = SelectionPolicy(top_k=2)
+    calls = orch.backend._client.completions.calls
+    with caplog.at_level(logging.INFO, logger="glassbox.selection"):
+        result = asyncio.run(orch.execute("Redis or Postgres?"))
+    assert result["selection"] == {"chosen": ["architect", "pragmatist"], "skipped": ["critic"], "explored": None}
+    assert len(calls) == 2 and "skipped ['critic']" in caplog.text
+    assert "Skipped (below trust cut): @critic" in orch.format_result("Redis or Postgres?", result)
+    assert len(asyncio.run(orch.execute("Redis or Postgres?", ["architect", "critic"]))["agent_responses"]) == 2
+    out = asyncio.run(orch.debate("Redis or Postgres?", parallel=True))
+    assert "━━ PANEL ━━" in out and "@critic" not in out.split("━━ ROUND 1")[1]
+    assert len(calls) == 2 + 2 + 2 * 3 + 2
+    assert orch.selection.stats() == {"top_k": 2, "explore": 0.0, "selections": 2, "explorations": 0, "calls_skipped": 2}
+
+
+def test_82_selection_explores_below_the_cut():
+    """With explore > 0 the last chosen slot sometimes goes to a lower-trust agent, at about that rate."""
+    from glassbox.selection import SelectionPolicy
+    trust = {"a": 0.9, "b": 0.8, "c": 0.5, "d": 0.4}
+    policy = SelectionPolicy(top_k=2, explore=0.2, seed=7)
+    picks = [policy.select(list(trust), trust) for _ in range(2000)]
+    explored = [p for p in picks if p["explored"]]
+    assert all(p["chosen"] == ["a", p["explored"]] and len(p["skipped"]) == 2 for p in explored)
+    assert all(p["chosen"] == ["a", "b"] for p in picks if not p["explored"])
+    assert 0.15 < len(explored) / 2000 < 0.25 and {p["explored"] for p in explored} == {"c", "d"}
+    assert SelectionPolicy().select(list(trust), trust)["chosen"] == list(trust)